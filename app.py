@@ -23,6 +23,7 @@ ROYAL_Stats - Покерный трекер для анализа статист
 import sys
 import os
 import logging
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon, QFont
 from PyQt6.QtCore import QLocale, QTranslator, QCoreApplication
@@ -95,4 +96,6 @@ def main():
 
 # Точка входа при запуске скрипта
 if __name__ == "__main__":
+    # Нужно для пула процессов разбора файлов в собранном (frozen) приложении
+    multiprocessing.freeze_support()
     main()
@@ -10,20 +10,47 @@ import os
 import sqlite3
 import uuid
 import logging
+from operator import attrgetter
 from typing import Dict, List, Optional, Union, Tuple, Any
 from datetime import datetime
 
+import numpy as np
+
 from db.schema import (
-    CREATE_TABLES_QUERIES, INSERT_TOURNAMENT, INSERT_KNOCKOUT,
-    UPDATE_STATISTICS, INSERT_INITIAL_STATISTICS, UPSERT_PLACE_DISTRIBUTION,
-    INSERT_SESSION, GET_STATISTICS, GET_PLACES_DISTRIBUTION,
+    CREATE_TABLES_QUERIES, CREATE_TRIGGERS_QUERIES, ADD_TOURNAMENTS_KNOCKOUTS_COUNT,
+    FILL_TOURNAMENTS_KNOCKOUTS_COUNT, INSERT_TOURNAMENT, INSERT_KNOCKOUT, UPDATE_TOURNAMENT_INITIAL_STACK,
+    UPDATE_STATISTICS, INSERT_INITIAL_STATISTICS,
+    INSERT_SESSION, GET_STATISTICS, GET_PLACES_DISTRIBUTION, GET_SESSION_PLACES_DISTRIBUTION,
     GET_SESSIONS, GET_SESSION_BY_ID, GET_TOURNAMENTS_BY_SESSION,
-    GET_KNOCKOUTS_BY_SESSION, DELETE_SESSION_DATA, DELETE_ALL_DATA
+    GET_KNOCKOUTS_BY_SESSION, DELETE_SESSION_DATA, DELETE_ALL_DATA,
+    UPSERT_PARSED_FILE, GET_PARSED_FILES, UPDATE_SESSION_NAME, BUMP_SESSION_STATS,
+    GET_SESSION_TOURNAMENT_TOTALS, GET_SESSION_PLACE_GROUPS
 )
 
 # Настройка логирования
 logger = logging.getLogger('ROYAL_Stats.Database')
 
+# Размер порции строк для одного вызова executemany при пакетной вставке
+BULK_INSERT_BATCH_SIZE = 5000
+
+# Поля TournamentSummary, попадающие в INSERT_TOURNAMENT (см. summary_row)
+_SUMMARY_ROW_FIELDS = attrgetter(
+    'tournament_id', 'buy_in', 'players', 'start_time', 'finish_place', 'prize_total',
+    'knockouts_x2', 'knockouts_x10', 'knockouts_x100', 'knockouts_x1000', 'knockouts_x10000'
+)
+
+# PRAGMA для соединения, выполняющего массовую загрузку файлов
+BULK_INSERT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 МБ страничного кэша
+)
+
+# Режим WAL сохраняется в файле базы, и рядом с ней появляются файлы журнала;
+# при удалении базы они удаляются вместе с ней
+SQLITE_SIDECAR_SUFFIXES = ('-wal', '-shm')
+
 
 class DatabaseManager:
     """
@@ -85,6 +112,31 @@ class DatabaseManager:
             self.cursor = None
             self.current_db_path = None
             
+    def enable_bulk_insert_mode(self) -> None:
+        """
+        Настраивает соединение для массовой загрузки данных.
+
+        WAL позволяет UI-потоку читать базу, пока идет запись, а
+        synchronous=OFF убирает fsync на каждой транзакции.
+        После загрузки следует вызвать disable_bulk_insert_mode.
+        """
+        if not self.connection:
+            return
+
+        for pragma in BULK_INSERT_PRAGMAS:
+            self.cursor.execute(pragma)
+        logger.debug(f"Включен режим массовой загрузки для {self.current_db_path}")
+
+    def disable_bulk_insert_mode(self) -> None:
+        """
+        Возвращает безопасный режим синхронизации после массовой загрузки.
+        """
+        if not self.connection:
+            return
+
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        logger.debug(f"Выключен режим массовой загрузки для {self.current_db_path}")
+
     def _create_tables(self) -> None:
         """
         Создает необходимые таблицы в базе данных, если их нет.
@@ -95,6 +147,16 @@ class DatabaseManager:
         for query in CREATE_TABLES_QUERIES:
             self.cursor.execute(query)
             
+        # Базы, созданные до появления счетчика накаутов турнира
+        self.cursor.execute("PRAGMA table_info(tournaments)")
+        if 'knockouts_count' not in {row['name'] for row in self.cursor.fetchall()}:
+            self.cursor.execute(ADD_TOURNAMENTS_KNOCKOUTS_COUNT)
+            self.cursor.execute(FILL_TOURNAMENTS_KNOCKOUTS_COUNT)
+            logger.info("Добавлен столбец tournaments.knockouts_count")
+            
+        for query in CREATE_TRIGGERS_QUERIES:
+            self.cursor.execute(query)
+            
         self.connection.commit()
         
     def create_database(self, db_name: str) -> str:
@@ -149,21 +211,18 @@ class StatsDatabase:
         """
         self.db_manager = db_manager
         
-    def save_tournament_data(self, tournament_data: Dict, session_id: str) -> None:
+    @staticmethod
+    def tournament_row(tournament_data: Dict, session_id: str) -> Tuple:
         """
-        Сохраняет данные о турнире в базу.
+        Преобразует словарь с данными о турнире в кортеж параметров INSERT_TOURNAMENT.
         
         Args:
             tournament_data: Словарь с данными о турнире
             session_id: ID сессии загрузки
-        """
-        # Проверяем подключение к БД
-        if not self.db_manager.connection:
-            raise ValueError("Не подключена база данных")
-            
-        # Логируем данные для отладки
-        logger.debug(f"Сохранение турнира, данные: {tournament_data}")
             
+        Returns:
+            Кортеж значений в порядке столбцов INSERT_TOURNAMENT
+        """
         # ИСПРАВЛЕНО: проверка и логирование значений нокаутов
         for key in ['knockouts_x2', 'knockouts_x10', 'knockouts_x100', 'knockouts_x1000', 'knockouts_x10000']:
             if key not in tournament_data or tournament_data[key] is None:
@@ -173,8 +232,7 @@ class StatsDatabase:
                 logger.warning(f"Некорректное значение {key}={tournament_data[key]}, будет установлено 0")
                 tournament_data[key] = 0
                 
-        # Подготавливаем параметры для вставки
-        params = (
+        return (
             tournament_data.get('tournament_id'),
             tournament_data.get('tournament_name', f"Tournament #{tournament_data.get('tournament_id')}"),
             tournament_data.get('game_type', 'No Limit Hold\'em'),
@@ -196,6 +254,90 @@ class StatsDatabase:
             tournament_data.get('average_initial_stack', 0.0)  # Новое поле для среднего начального стека
         )
         
+    @staticmethod
+    def summary_row(summary: Any, session_id: str) -> Tuple:
+        """
+        Преобразует TournamentSummary в кортеж параметров INSERT_TOURNAMENT.
+        
+        Значения читаются напрямую из атрибутов, без промежуточного словаря
+        dataclasses.asdict; результат совпадает с tournament_row для того же турнира.
+        
+        Args:
+            summary: Результат разбора файла сводки (TournamentSummary)
+            session_id: ID сессии загрузки
+            
+        Returns:
+            Кортеж значений в порядке столбцов INSERT_TOURNAMENT
+        """
+        (tournament_id, buy_in, players, start_time, finish_place, prize,
+         *knockouts) = _SUMMARY_ROW_FIELDS(summary)
+        knockouts = [ko if isinstance(ko, int) and ko >= 0 else 0 for ko in knockouts]
+        return (
+            tournament_id, f"Tournament #{tournament_id}", 'No Limit Hold\'em',
+            buy_in, 0.0, 0.0, buy_in, players, 0.0,
+            start_time, finish_place, prize,
+            *knockouts,
+            session_id, 0.0
+        )
+        
+    @staticmethod
+    def tournament_totals(rows: List[Tuple]) -> Dict:
+        """
+        Считает итоги пакета турниров для bump_session_stats.
+        
+        Args:
+            rows: Список кортежей в порядке столбцов INSERT_TOURNAMENT
+            
+        Returns:
+            Словарь с количеством турниров, суммой мест, выигрышей и бай-инов
+        """
+        return {
+            'tournaments': len(rows),
+            'finish_place_sum': sum(row[10] or 0 for row in rows),
+            'prize': sum(row[11] or 0 for row in rows),
+            'buy_in': sum(row[6] or 0 for row in rows),
+        }
+        
+    @staticmethod
+    def knockout_row(tournament_id: str, knockout: Dict, session_id: str) -> Tuple:
+        """
+        Преобразует словарь с данными о нокауте в кортеж параметров INSERT_KNOCKOUT.
+        
+        Args:
+            tournament_id: ID турнира
+            knockout: Словарь с данными о нокауте
+            session_id: ID сессии загрузки
+            
+        Returns:
+            Кортеж значений в порядке столбцов INSERT_KNOCKOUT
+        """
+        return (
+            tournament_id,
+            knockout.get('hand_id', ''),
+            knockout.get('knocked_out_player', 'Unknown'),
+            knockout.get('pot_size', 0),
+            knockout.get('multi_knockout', False),
+            session_id
+        )
+        
+    def save_tournament_data(self, tournament_data: Dict, session_id: str) -> None:
+        """
+        Сохраняет данные о турнире в базу.
+        
+        Args:
+            tournament_data: Словарь с данными о турнире
+            session_id: ID сессии загрузки
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            raise ValueError("Не подключена база данных")
+            
+        # Логируем данные для отладки
+        logger.debug(f"Сохранение турнира, данные: {tournament_data}")
+            
+        # Подготавливаем параметры для вставки
+        params = self.tournament_row(tournament_data, session_id)
+        
         # Выполняем вставку
         try:
             self.db_manager.cursor.execute(INSERT_TOURNAMENT, params)
@@ -205,17 +347,142 @@ class StatsDatabase:
             logger.error(f"Ошибка при сохранении турнира: {str(e)}", exc_info=True)
             raise
         
-        # Обновляем распределение мест
-        place = tournament_data.get('finish_place')
-        # ИСПРАВЛЕНО: Проверяем, что место в диапазоне 1-9
-        if place and 1 <= place <= 9:
-            try:
-                self.db_manager.cursor.execute(UPSERT_PLACE_DISTRIBUTION, (place, 1))
-                self.db_manager.connection.commit()
-                logger.debug(f"Обновлено распределение мест для места {place}")
-            except Exception as e:
-                logger.error(f"Ошибка при обновлении распределения мест: {str(e)}", exc_info=True)
+        # Распределение мест отдельно не хранится: оно считается группировкой
+        # по таблице tournaments (см. get_places_distribution)
                 
+    def save_tournaments_bulk(self, rows: List[Tuple]) -> int:
+        """
+        Сохраняет пакет турниров одной транзакцией.
+        
+        Вместо INSERT + COMMIT на каждый файл строки вставляются через
+        executemany порциями по BULK_INSERT_BATCH_SIZE, а фиксация выполняется
+        один раз в конце, что убирает fsync на каждый турнир.
+        
+        Args:
+            rows: Список кортежей в порядке столбцов INSERT_TOURNAMENT
+                  (см. tournament_row)
+            
+        Returns:
+            Количество сохраненных турниров
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            raise ValueError("Не подключена база данных")
+            
+        if not rows:
+            return 0
+            
+        try:
+            # sqlite3 сам открывает транзакцию перед первым INSERT,
+            # поэтому все порции попадают в одну транзакцию до commit()
+            for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+                self.db_manager.cursor.executemany(
+                    INSERT_TOURNAMENT, rows[start:start + BULK_INSERT_BATCH_SIZE]
+                )
+            self.db_manager.connection.commit()
+            logger.debug(f"Пакетно сохранено турниров: {len(rows)}")
+            return len(rows)
+        except Exception as e:
+            self.db_manager.connection.rollback()
+            logger.error(f"Ошибка при пакетном сохранении турниров: {str(e)}", exc_info=True)
+            raise
+            
+    def save_knockouts_bulk(self, rows: List[Tuple]) -> int:
+        """
+        Сохраняет пакет нокаутов одной транзакцией.
+        
+        Args:
+            rows: Список кортежей в порядке столбцов INSERT_KNOCKOUT
+                  (см. knockout_row)
+            
+        Returns:
+            Количество сохраненных нокаутов
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            raise ValueError("Не подключена база данных")
+            
+        if not rows:
+            return 0
+            
+        try:
+            for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+                self.db_manager.cursor.executemany(
+                    INSERT_KNOCKOUT, rows[start:start + BULK_INSERT_BATCH_SIZE]
+                )
+            self.db_manager.connection.commit()
+            logger.debug(f"Пакетно сохранено нокаутов: {len(rows)}")
+            return len(rows)
+        except Exception as e:
+            self.db_manager.connection.rollback()
+            logger.error(f"Ошибка при пакетном сохранении нокаутов: {str(e)}", exc_info=True)
+            raise
+            
+    def update_initial_stacks_bulk(self, rows: List[Tuple]) -> None:
+        """
+        Обновляет средний начальный стек для пакета турниров одной транзакцией.
+        
+        Args:
+            rows: Список кортежей (average_initial_stack, tournament_id, session_id).
+                  Строки для турниров, которых еще нет в базе, ни на что не влияют.
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            raise ValueError("Не подключена база данных")
+            
+        if not rows:
+            return
+            
+        try:
+            self.db_manager.cursor.executemany(UPDATE_TOURNAMENT_INITIAL_STACK, rows)
+            self.db_manager.connection.commit()
+            logger.debug(f"Обновлен средний стек для {len(rows)} турниров")
+        except Exception as e:
+            self.db_manager.connection.rollback()
+            logger.error(f"Ошибка при пакетном обновлении среднего стека: {str(e)}", exc_info=True)
+            raise
+            
+    def get_parsed_files(self) -> Dict[str, Tuple[float, int]]:
+        """
+        Возвращает кэш уже загруженных файлов.
+        
+        Returns:
+            Словарь {путь: (mtime, размер)}
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            return {}
+            
+        try:
+            self.db_manager.cursor.execute(GET_PARSED_FILES)
+            return {path: (mtime, size) for path, mtime, size in self.db_manager.cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Ошибка при получении кэша загруженных файлов: {str(e)}", exc_info=True)
+            return {}
+            
+    def save_parsed_files_bulk(self, rows: List[Tuple]) -> None:
+        """
+        Записывает пакет загруженных файлов в кэш одной транзакцией.
+        
+        Args:
+            rows: Список кортежей (path, mtime, size, tournament_id, session_id)
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            raise ValueError("Не подключена база данных")
+            
+        if not rows:
+            return
+            
+        try:
+            self.db_manager.cursor.executemany(UPSERT_PARSED_FILE, rows)
+            self.db_manager.connection.commit()
+            logger.debug(f"Добавлено в кэш загруженных файлов: {len(rows)}")
+        except Exception as e:
+            self.db_manager.connection.rollback()
+            logger.error(f"Ошибка при сохранении кэша загруженных файлов: {str(e)}", exc_info=True)
+            raise
+            
     def save_knockouts_data(self, tournament_id: str, knockouts: List[Dict], session_id: str) -> None:
         """
         Сохраняет данные о нокаутах в базу.
@@ -240,14 +507,7 @@ class StatsDatabase:
         try:
             # Добавляем каждый нокаут в базу
             for ko in knockouts:
-                params = (
-                    tournament_id,
-                    ko.get('hand_id', ''),
-                    ko.get('knocked_out_player', 'Unknown'),
-                    ko.get('pot_size', 0),
-                    ko.get('multi_knockout', False),
-                    session_id
-                )
+                params = self.knockout_row(tournament_id, ko, session_id)
                 
                 # Выполняем вставку
                 self.db_manager.cursor.execute(INSERT_KNOCKOUT, params)
@@ -297,6 +557,64 @@ class StatsDatabase:
             logger.error(f"Ошибка при создании сессии: {str(e)}", exc_info=True)
             raise
         
+    def rename_session(self, session_id: str, new_name: str) -> None:
+        """
+        Переименовывает сессию.
+        
+        Args:
+            session_id: ID сессии
+            new_name: Новое название сессии
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            raise ValueError("Не подключена база данных")
+            
+        try:
+            # Транзакция фиксируется или откатывается контекстным менеджером соединения
+            with self.db_manager.connection:
+                self.db_manager.connection.execute(UPDATE_SESSION_NAME, (new_name, session_id))
+            logger.debug(f"Сессия {session_id} переименована в {new_name}")
+        except Exception as e:
+            logger.error(f"Ошибка при переименовании сессии {session_id}: {str(e)}", exc_info=True)
+            raise
+        
+    def bump_session_stats(self, session_id: str, totals: Dict) -> None:
+        """
+        Инкрементально обновляет статистику сессии по итогам загруженного пакета.
+        
+        В отличие от update_session_stats не пересчитывает агрегаты по всем
+        турнирам сессии: к сохраненным значениям прибавляются итоги пакета,
+        поэтому стоимость зависит от размера пакета, а не от размера базы.
+        
+        Args:
+            session_id: ID сессии
+            totals: Итоги пакета; отсутствующие ключи считаются нулевыми:
+                    tournaments, finish_place_sum, prize, buy_in (см. tournament_totals),
+                    knockouts - количество добавленных нокаутов,
+                    stacks_updated - обновлялись ли средние начальные стеки
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            raise ValueError("Не подключена база данных")
+            
+        params = {
+            'session_id': session_id,
+            'tournaments': totals.get('tournaments', 0),
+            'finish_place_sum': totals.get('finish_place_sum', 0),
+            'knockouts': totals.get('knockouts', 0),
+            'prize': totals.get('prize', 0.0),
+            'buy_in': totals.get('buy_in', 0.0),
+            'stacks_updated': bool(totals.get('stacks_updated')),
+        }
+        try:
+            self.db_manager.cursor.execute(BUMP_SESSION_STATS, params)
+            self.db_manager.connection.commit()
+            logger.debug(f"Инкрементально обновлена статистика сессии {session_id}: {params}")
+        except Exception as e:
+            self.db_manager.connection.rollback()
+            logger.error(f"Ошибка при обновлении статистики сессии {session_id}: {str(e)}", exc_info=True)
+            raise
+        
     def update_session_stats(self, session_id: str) -> None:
         """
         Обновляет статистику указанной сессии.
@@ -347,6 +665,14 @@ class StatsDatabase:
             result = self.db_manager.cursor.fetchone()[0]
             avg_initial_stack = result if result is not None else 0.0
             
+            # Получаем общую сумму бай-инов
+            self.db_manager.cursor.execute(
+                "SELECT SUM(total_buy_in) FROM tournaments WHERE session_id = ? AND total_buy_in IS NOT NULL",
+                (session_id,)
+            )
+            result = self.db_manager.cursor.fetchone()[0]
+            total_buy_in = result if result is not None else 0.0
+            
             # Обновляем статистику сессии
             self.db_manager.cursor.execute(
                 """
@@ -355,10 +681,12 @@ class StatsDatabase:
                     knockouts_count = ?,
                     avg_finish_place = ?,
                     total_prize = ?,
-                    avg_initial_stack = ?
+                    avg_initial_stack = ?,
+                    total_buy_in = ?
                 WHERE session_id = ?
                 """,
-                (tournaments_count, knockouts_count, avg_finish_place, total_prize, avg_initial_stack, session_id)
+                (tournaments_count, knockouts_count, avg_finish_place, total_prize, avg_initial_stack,
+                 total_buy_in, session_id)
             )
             
             # Сохраняем изменения
@@ -423,17 +751,14 @@ class StatsDatabase:
             result = self.db_manager.cursor.fetchone()[0]
             avg_finish_place = result if result is not None else 0
             
-            # Получаем количество первых мест
-            self.db_manager.cursor.execute("SELECT COUNT(*) FROM tournaments WHERE finish_place = 1")
-            first_places = self.db_manager.cursor.fetchone()[0]
-            
-            # Получаем количество вторых мест
-            self.db_manager.cursor.execute("SELECT COUNT(*) FROM tournaments WHERE finish_place = 2")
-            second_places = self.db_manager.cursor.fetchone()[0]
-            
-            # Получаем количество третьих мест
-            self.db_manager.cursor.execute("SELECT COUNT(*) FROM tournaments WHERE finish_place = 3")
-            third_places = self.db_manager.cursor.fetchone()[0]
+            # Получаем количество первых, вторых и третьих мест одним запросом по индексу
+            self.db_manager.cursor.execute(
+                "SELECT finish_place, COUNT(*) FROM tournaments WHERE finish_place IN (1, 2, 3) GROUP BY finish_place"
+            )
+            top_places = dict(self.db_manager.cursor.fetchall())
+            first_places = top_places.get(1, 0)
+            second_places = top_places.get(2, 0)
+            third_places = top_places.get(3, 0)
             
             # Получаем общий выигрыш
             self.db_manager.cursor.execute("SELECT SUM(prize) FROM tournaments WHERE prize IS NOT NULL")
@@ -551,33 +876,40 @@ class StatsDatabase:
             logger.error(f"Ошибка при получении общей статистики: {str(e)}", exc_info=True)
             raise
         
-    def get_places_distribution(self) -> Dict[int, int]:
+    def get_places_distribution(self, session_id: Optional[str] = None) -> np.ndarray:
         """
         Возвращает распределение мест из базы данных.
         
+        Распределение считается группировкой турниров по месту; запрос
+        обслуживается индексом idx_t_sess без чтения самой таблицы.
+        
+        Args:
+            session_id: ID сессии или None для всех сессий
+            
         Returns:
-            Словарь {место: количество_турниров}
+            Массив int64 длины 9: элемент place-1 — количество турниров с местом place
         """
+        distribution = np.zeros(9, dtype=np.int64)
+        
         # Проверяем подключение к БД
         if not self.db_manager.connection:
-            return {i: 0 for i in range(1, 10)}
+            return distribution
         
         try:    
             # Получаем распределение мест
-            self.db_manager.cursor.execute(GET_PLACES_DISTRIBUTION)
-            rows = self.db_manager.cursor.fetchall()
-            
-            # Преобразуем результат в словарь
-            distribution = {i: 0 for i in range(1, 10)}
-            for row in rows:
-                distribution[row['place']] = row['count']
+            if session_id is None:
+                self.db_manager.cursor.execute(GET_PLACES_DISTRIBUTION)
+            else:
+                self.db_manager.cursor.execute(GET_SESSION_PLACES_DISTRIBUTION, (session_id,))
+            for place, count in self.db_manager.cursor.fetchall():
+                distribution[place - 1] = count
                 
             logger.debug(f"Получено распределение мест: {distribution}")
             return distribution
         except Exception as e:
             logger.error(f"Ошибка при получении распределения мест: {str(e)}", exc_info=True)
             # При ошибке возвращаем пустое распределение
-            return {i: 0 for i in range(1, 10)}
+            return np.zeros(9, dtype=np.int64)
         
     def get_sessions(self) -> List[Dict]:
         """
@@ -674,6 +1006,50 @@ class StatsDatabase:
             logger.error(f"Ошибка при получении турниров сессии {session_id}: {str(e)}", exc_info=True)
             return []
         
+    def get_session_tournament_totals(self, session_id: str) -> Dict:
+        """
+        Возвращает итоги турниров сессии: количество 1-3 мест и нокаутов по типам.
+        
+        Args:
+            session_id: ID сессии
+            
+        Returns:
+            Словарь с ключами first_places, second_places, third_places
+            и total_knockouts_x2 ... total_knockouts_x10000
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            return {}
+            
+        try:
+            self.db_manager.cursor.execute(GET_SESSION_TOURNAMENT_TOTALS, (session_id,))
+            return dict(self.db_manager.cursor.fetchone())
+        except Exception as e:
+            logger.error(f"Ошибка при получении итогов турниров сессии {session_id}: {str(e)}", exc_info=True)
+            return {}
+        
+    def get_session_place_groups(self, session_id: str) -> List[Tuple[int, int, int]]:
+        """
+        Возвращает количество турниров сессии с местом 1-9 по парам (место, количество игроков).
+        
+        Args:
+            session_id: ID сессии
+            
+        Returns:
+            Список кортежей (finish_place, players_count, count);
+            неизвестное количество игроков заменено на 9
+        """
+        # Проверяем подключение к БД
+        if not self.db_manager.connection:
+            return []
+            
+        try:
+            self.db_manager.cursor.execute(GET_SESSION_PLACE_GROUPS, (session_id,))
+            return [tuple(row) for row in self.db_manager.cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Ошибка при получении распределения мест сессии {session_id}: {str(e)}", exc_info=True)
+            return []
+        
     def get_session_knockouts(self, session_id: str) -> List[Dict]:
         """
         Возвращает список нокаутов указанной сессии.
@@ -31,6 +31,7 @@ CREATE TABLE IF NOT EXISTS tournaments (
     knockouts_x10000 INTEGER,
     session_id TEXT,
     average_initial_stack REAL,
+    knockouts_count INTEGER DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 )
 """
@@ -97,13 +98,107 @@ CREATE TABLE IF NOT EXISTS sessions (
 )
 """
 
+# Таблица уже загруженных файлов: повторно выбранный файл с теми же
+# mtime и размером не разбирается заново
+CREATE_PARSED_FILES_TABLE = """
+CREATE TABLE IF NOT EXISTS parsed_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL,
+    size INTEGER,
+    tournament_id TEXT,
+    session_id TEXT
+)
+"""
+
+# Покрывающий индекс для чтения кэша файлов без обращения к таблице
+CREATE_PARSED_FILES_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_parsed_files_key ON parsed_files (path, mtime, size)
+"""
+
+# Индексы под агрегирующие запросы статистики: выборки по сессии и
+# группировка по месту выполняются по индексу, без полного сканирования
+CREATE_TOURNAMENTS_SESSION_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_t_sess ON tournaments (session_id, finish_place)
+"""
+
+CREATE_KNOCKOUTS_SESSION_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_k_sess ON knockouts (session_id, tournament_id)
+"""
+
+# Индекс для подсчета накаутов по турнирам одной группировкой (список турниров)
+CREATE_KNOCKOUTS_TOURNAMENT_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_knockouts_tid_sid ON knockouts (tournament_id, session_id)
+"""
+
+# Индекс для поиска турнира сессии триггерами счетчика накаутов
+CREATE_TOURNAMENTS_TOURNAMENT_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_t_tid_sid ON tournaments (tournament_id, session_id)
+"""
+
 # Список всех SQL-запросов для создания таблиц
 CREATE_TABLES_QUERIES = [
     CREATE_TOURNAMENTS_TABLE,
     CREATE_KNOCKOUTS_TABLE,
     CREATE_STATISTICS_TABLE,
     CREATE_PLACES_DISTRIBUTION_TABLE,
-    CREATE_SESSIONS_TABLE
+    CREATE_SESSIONS_TABLE,
+    CREATE_PARSED_FILES_TABLE,
+    CREATE_PARSED_FILES_INDEX,
+    CREATE_TOURNAMENTS_SESSION_INDEX,
+    CREATE_KNOCKOUTS_SESSION_INDEX,
+    CREATE_KNOCKOUTS_TOURNAMENT_INDEX,
+    CREATE_TOURNAMENTS_TOURNAMENT_INDEX
+]
+
+# Столбец tournaments.knockouts_count для баз, созданных до его появления
+ADD_TOURNAMENTS_KNOCKOUTS_COUNT = """
+ALTER TABLE tournaments ADD COLUMN knockouts_count INTEGER DEFAULT 0
+"""
+
+# Заполнение счетчика накаутов турниров по уже загруженным накаутам
+FILL_TOURNAMENTS_KNOCKOUTS_COUNT = """
+UPDATE tournaments SET knockouts_count = (
+    SELECT COUNT(*) FROM knockouts k
+    WHERE k.session_id = tournaments.session_id AND k.tournament_id = tournaments.tournament_id
+)
+"""
+
+# Триггеры, поддерживающие tournaments.knockouts_count: список турниров
+# читает количество накаутов как обычный столбец, без подзапросов.
+# Накауты могут быть загружены раньше сводки турнира, поэтому при вставке
+# турнира счетчик заполняется по уже загруженным накаутам.
+CREATE_KNOCKOUT_INSERT_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_knockouts_insert AFTER INSERT ON knockouts
+BEGIN
+    UPDATE tournaments SET knockouts_count = knockouts_count + 1
+    WHERE tournament_id = NEW.tournament_id AND session_id = NEW.session_id;
+END
+"""
+
+CREATE_KNOCKOUT_DELETE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_knockouts_delete AFTER DELETE ON knockouts
+BEGIN
+    UPDATE tournaments SET knockouts_count = knockouts_count - 1
+    WHERE tournament_id = OLD.tournament_id AND session_id = OLD.session_id;
+END
+"""
+
+CREATE_TOURNAMENT_INSERT_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_tournaments_insert AFTER INSERT ON tournaments
+BEGIN
+    UPDATE tournaments SET knockouts_count = (
+        SELECT COUNT(*) FROM knockouts
+        WHERE session_id = NEW.session_id AND tournament_id = NEW.tournament_id
+    )
+    WHERE id = NEW.id;
+END
+"""
+
+# Триггеры создаются после миграции столбцов (см. DatabaseManager._create_tables)
+CREATE_TRIGGERS_QUERIES = [
+    CREATE_KNOCKOUT_INSERT_TRIGGER,
+    CREATE_KNOCKOUT_DELETE_TRIGGER,
+    CREATE_TOURNAMENT_INSERT_TRIGGER
 ]
 
 # SQL-запросы для вставки данных
@@ -125,6 +220,12 @@ INSERT INTO knockouts (
 ) VALUES (?, ?, ?, ?, ?, ?)
 """
 
+# Обновление среднего начального стека турнира
+UPDATE_TOURNAMENT_INITIAL_STACK = """
+UPDATE tournaments SET average_initial_stack = ?
+WHERE tournament_id = ? AND session_id = ?
+"""
+
 # Обновление общей статистики
 UPDATE_STATISTICS = """
 UPDATE statistics SET
@@ -151,12 +252,11 @@ INSERT_INITIAL_STATISTICS = """
 INSERT OR IGNORE INTO statistics (id) VALUES (1)
 """
 
-# Вставка или обновление распределения мест
-UPSERT_PLACE_DISTRIBUTION = """
-INSERT INTO places_distribution (place, count) 
-VALUES (?, ?)
-ON CONFLICT(place) DO UPDATE SET
-    count = count + excluded.count
+# Запись загруженного файла в кэш
+UPSERT_PARSED_FILE = """
+INSERT OR REPLACE INTO parsed_files (
+    path, mtime, size, tournament_id, session_id
+) VALUES (?, ?, ?, ?, ?)
 """
 
 # Вставка информации о сессии
@@ -167,6 +267,36 @@ INSERT INTO sessions (
 ) VALUES (?, ?, ?, ?, ?, ?, ?)
 """
 
+# Инкрементальное обновление статистики сессии после загрузки пакета.
+# В UPDATE правые части видят старые значения столбцов, поэтому среднее место
+# пересчитывается как взвешенное среднее старого значения и нового пакета.
+BUMP_SESSION_STATS = """
+UPDATE sessions SET
+    avg_finish_place = CASE
+        WHEN tournaments_count + :tournaments > 0
+        THEN (avg_finish_place * tournaments_count + :finish_place_sum) / (tournaments_count + :tournaments)
+        ELSE 0
+    END,
+    tournaments_count = tournaments_count + :tournaments,
+    knockouts_count = knockouts_count + :knockouts,
+    total_prize = total_prize + :prize,
+    total_buy_in = total_buy_in + :buy_in,
+    avg_initial_stack = CASE
+        WHEN :stacks_updated
+        THEN IFNULL((
+            SELECT AVG(average_initial_stack) FROM tournaments
+            WHERE session_id = :session_id AND average_initial_stack > 0
+        ), 0)
+        ELSE avg_initial_stack
+    END
+WHERE session_id = :session_id
+"""
+
+# Переименование сессии
+UPDATE_SESSION_NAME = """
+UPDATE sessions SET session_name = ? WHERE session_id = ?
+"""
+
 # SQL-запросы для получения данных
 
 # Получение общей статистики
@@ -174,9 +304,46 @@ GET_STATISTICS = """
 SELECT * FROM statistics WHERE id = 1
 """
 
-# Получение распределения мест
+# Получение распределения мест (по индексу idx_t_sess)
 GET_PLACES_DISTRIBUTION = """
-SELECT place, count FROM places_distribution ORDER BY place
+SELECT finish_place, COUNT(*) FROM tournaments
+WHERE finish_place BETWEEN 1 AND 9
+GROUP BY finish_place
+"""
+
+# Получение распределения мест сессии (по индексу idx_t_sess)
+GET_SESSION_PLACES_DISTRIBUTION = """
+SELECT finish_place, COUNT(*) FROM tournaments
+WHERE session_id = ? AND finish_place BETWEEN 1 AND 9
+GROUP BY finish_place
+"""
+
+# Итоги турниров сессии одним агрегирующим проходом
+GET_SESSION_TOURNAMENT_TOTALS = """
+SELECT
+    IFNULL(SUM(finish_place = 1), 0) AS first_places,
+    IFNULL(SUM(finish_place = 2), 0) AS second_places,
+    IFNULL(SUM(finish_place = 3), 0) AS third_places,
+    IFNULL(SUM(knockouts_x2), 0) AS total_knockouts_x2,
+    IFNULL(SUM(knockouts_x10), 0) AS total_knockouts_x10,
+    IFNULL(SUM(knockouts_x100), 0) AS total_knockouts_x100,
+    IFNULL(SUM(knockouts_x1000), 0) AS total_knockouts_x1000,
+    IFNULL(SUM(knockouts_x10000), 0) AS total_knockouts_x10000
+FROM tournaments WHERE session_id = ?
+"""
+
+# Количество турниров сессии по паре (место, количество игроков)
+# для построения нормализованного распределения мест.
+# Неизвестное количество игроков (NULL или 0) считается равным 9.
+GET_SESSION_PLACE_GROUPS = """
+SELECT finish_place, IFNULL(NULLIF(players_count, 0), 9) AS players, COUNT(*) FROM tournaments
+WHERE session_id = ? AND finish_place BETWEEN 1 AND 9
+GROUP BY finish_place, players
+"""
+
+# Получение кэша загруженных файлов
+GET_PARSED_FILES = """
+SELECT path, mtime, size FROM parsed_files
 """
 
 # Получение списка сессий
@@ -217,6 +384,7 @@ ORDER BY start_time DESC
 DELETE_SESSION_DATA = """
 DELETE FROM tournaments WHERE session_id = ?;
 DELETE FROM knockouts WHERE session_id = ?;
+DELETE FROM parsed_files WHERE session_id = ?;
 DELETE FROM sessions WHERE session_id = ?;
 """
 
@@ -226,6 +394,7 @@ DELETE FROM tournaments;
 DELETE FROM knockouts;
 DELETE FROM sessions;
 DELETE FROM places_distribution;
+DELETE FROM parsed_files;
 UPDATE statistics SET
     total_tournaments = 0,
     total_knockouts = 0,
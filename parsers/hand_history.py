@@ -11,6 +11,7 @@
 import re
 import os
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 
@@ -98,7 +99,7 @@ class HandHistoryParser:
             'average_initial_stack': 0  # Добавлено новое поле для среднего начального стека
         }
         
-        # Извлекаем ID турнира из файла
+        # Файл читается один раз: из этого же текста берутся ID турнира и раздачи
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
                 content = file.read()
@@ -112,7 +113,7 @@ class HandHistoryParser:
         
         # Анализируем раздачи с помощью алгоритма экспертов
         try:
-            hands = self._parse_file(Path(file_path))
+            hands = self._parse_lines(content.splitlines())
             result['hands_count'] = len(hands)
             logger.debug(f"Найдено {len(hands)} раздач в файле {file_path}")
             
@@ -193,7 +194,18 @@ class HandHistoryParser:
         Returns:
             Список объектов Hand
         """
-        lines = path.read_text(encoding='utf-8', errors='ignore').splitlines()
+        return self._parse_lines(path.read_text(encoding='utf-8', errors='ignore').splitlines())
+
+    def _parse_lines(self, lines: List[str]) -> List[Hand]:
+        """
+        Разбирает уже прочитанные строки файла на отдельные раздачи.
+        
+        Args:
+            lines: Строки файла истории рук
+            
+        Returns:
+            Список объектов Hand
+        """
         hands: List[Hand] = []
         i = 0
         while i < len(lines):
@@ -449,6 +461,43 @@ class HandHistoryParser:
         return all_knockouts
 
 
+@lru_cache(maxsize=1)
+def _process_parser() -> HandHistoryParser:
+    """
+    Возвращает парсер текущего процесса.
+    
+    HandHistoryParser не хранит состояние между файлами, поэтому его регулярные
+    выражения компилируются один раз на процесс, а не на каждый файл.
+    """
+    return HandHistoryParser()
+
+
+def parse_hand_history_file(file_path: str) -> Tuple[str, Optional[Dict], Optional[str]]:
+    """
+    Разбирает файл истории рук в дочернем процессе пула.
+    
+    Функция определена на уровне модуля, чтобы её можно было передать в
+    ProcessPoolExecutor. Возвращаются только поля, нужные для сохранения в БД:
+    подробный список раздач не передается обратно между процессами.
+    
+    Args:
+        file_path: Путь к файлу
+        
+    Returns:
+        Кортеж (путь, результат или None, текст ошибки или None)
+    """
+    try:
+        result = _process_parser().parse_file(file_path)
+    except Exception as e:
+        return file_path, None, str(e)
+    
+    return file_path, {
+        'tournament_id': result['tournament_id'],
+        'knockouts': result['knockouts'],
+        'average_initial_stack': result['average_initial_stack']
+    }, None
+
+
 # Пример использования
 if __name__ == "__main__":
     parser = HandHistoryParser()
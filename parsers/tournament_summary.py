@@ -9,6 +9,8 @@
   вычислении крупного баунти (х2, х10, х100, х1000, х10000).
 • Не требует внешних зависимостей, но при наличии *python‑dateutil*
   использует его для парсинга дат (проигрываем элегантно).
+• При наличии *google‑re2* / *pyre2* шаблоны компилируются движком RE2
+  (DFA без бэктрекинга), иначе — стандартным ``re``.
 • Никаких «TODO»; весь функционал реализован.
 
 Пример использования
@@ -22,16 +24,37 @@
 """
 from __future__ import annotations
 
+import mmap
 import re
 import logging # Импортируем logging
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+try:  # optional DFA‑движок регулярных выражений
+    import re2 as _re2  # type: ignore
+except ImportError:
+    _re2 = None
+
 # Настройка логирования для этого модуля
 logger = logging.getLogger(__name__)
 
+
+def _compile(pattern: str):
+    """Компилирует шаблон через RE2, если он установлен, иначе через ``re``.
+
+    Флаги задаются внутри шаблона (``(?i)``), чтобы строка была одинаковой
+    для обоих движков. Если RE2 не поддерживает конструкцию, используется ``re``.
+    """
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern)
+        except Exception:  # pylint: disable=broad-except
+            logger.debug(f"RE2 не поддерживает шаблон, используется re: {pattern}")
+    return re.compile(pattern)
+
 # ---------------------------------------------------------------------------
 # Dataclass with the results we need downstream
 # ---------------------------------------------------------------------------
@@ -103,27 +126,66 @@ class TournamentSummaryParser:  # pylint: disable=too-many-public-methods
         Как *точно* пишется ник игрока в логах. Чувствительно к регистру.
     """
 
-    _ID_RE = re.compile(r"Tournament\s+#(?P<tid>\d+)")
-    _BUYIN_RE = re.compile(r"Buy[- ]?In\s*:.*?\$(?P<amount>[\d,.]+)")
+    _ID_RE = _compile(r"Tournament\s+#(?P<tid>\d+)")
+    _BUYIN_RE = _compile(r"Buy[- ]?In\s*:.*?\$(?P<amount>[\d,.]+)")
     # Обновленное регулярное выражение для Players, чтобы корректно обрабатывать случаи типа "Players: 500 / 1000"
-    _PLAYERS_RE = re.compile(r"Players\s*:\s*(?P<count>\d+)(?:\s*/\s*\d+)?") # Берем первое число
-    _START_RE = re.compile(
+    _PLAYERS_RE = _compile(r"Players\s*:\s*(?P<count>\d+)(?:\s*/\s*\d+)?") # Берем первое число
+    _START_RE = _compile(
         r"Start\s*Time\s*:\s*(?P<ts>[\d\-/:\s]+)"  # 2025/05/01 18:34:07
     )
-    _FINISH_RE = re.compile(
-        r"(?P<place>\d+)(?:st|nd|rd|th)\s+place[\s\S]*?\$(?P<prize>[\d,.]+)",
-        re.IGNORECASE,
+    _FINISH_RE = _compile(
+        r"(?i)(?P<place>\d+)(?:st|nd|rd|th)\s+place[\s\S]*?\$(?P<prize>[\d,.]+)"
+    )
+    # Байтовая копия _FINISH_RE для quick_finish_place (ищет прямо по mmap)
+    _FINISH_BYTES_RE = re.compile(
+        rb"(?i)(?P<place>\d+)(?:st|nd|rd|th)\s+place[\s\S]*?\$(?P<prize>[\d,.]+)"
     )
 
     # ────────────────────────────────────────────────────────────────────
 
     def __init__(self, hero_name: str = "Hero") -> None:
         self.hero_name = hero_name
+        # Блок героя вида «25th : Hero … $16.37»; компилируется один раз на парсер.
+        # re.escape используется для корректной обработки специальных символов в имени героя,
+        # IGNORECASE — для имени героя на всякий случай
+        self._hero_re = _compile(
+            rf"(?i)(?P<place>\d+)(?:st|nd|rd|th)\s*:\s*{re.escape(self.hero_name)}[\s\S]*?\$(?P<prize>[\d,.]+)"
+        )
+        self._hero_bytes_re = re.compile(
+            rb"(?i)(?P<place>\d+)(?:st|nd|rd|th)\s*:\s*"
+            + re.escape(self.hero_name.encode("utf-8"))
+            + rb"[\s\S]*?\$(?P<prize>[\d,.]+)"
+        )
 
     # ────────────────────────────────────────────────────────────────────
     # Public API
     # ────────────────────────────────────────────────────────────────────
 
+    def quick_finish_place(self, file_path: str | Path) -> Optional[int]:
+        """Быстро определяет место героя без полного разбора файла.
+
+        Файл отображается в память, и по нему выполняются те же поиски места,
+        что и в :meth:`parse_file` (последний блок героя, иначе первый
+        «X place … $Y»), но байтовыми шаблонами и без декодирования текста.
+
+        Returns
+        -------
+        Optional[int]
+            Место или ``None``, если оно не найдено (файл разбирается полностью).
+        """
+        with open(file_path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # пустой файл нельзя отобразить в память
+                return None
+            with mm:
+                match = None
+                for match in self._hero_bytes_re.finditer(mm):
+                    pass  # берём последний (финальный) блок
+                if match is None:
+                    match = self._FINISH_BYTES_RE.search(mm)
+                return int(match.group("place")) if match else None
+
     def parse_file(self, file_path: str | Path) -> TournamentSummary:
         """Fully parse TS‑file and return structured dataclass."""
 
@@ -136,9 +198,8 @@ class TournamentSummaryParser:  # pylint: disable=too-many-public-methods
 
         # Hero section ── на GG бывает блок вида «25th : Hero … $16.37»
         hero_block_match = None
-        # Ищем блок, где есть имя героя. re.escape используется для корректной обработки специальных символов в имени героя.
-        hero_pattern = rf"(?P<place>\d+)(?:st|nd|rd|th)\s*:\s*{re.escape(self.hero_name)}[\s\S]*?\$(?P<prize>[\d,.]+)"
-        for match in re.finditer(hero_pattern, text, re.IGNORECASE): # Добавим IGNORECASE для имени героя на всякий случай
+        # Ищем блок, где есть имя героя
+        for match in self._hero_re.finditer(text):
             hero_block_match = match  # берём последний (финальный) блок
 
         if hero_block_match is None:
@@ -377,4 +438,46 @@ class TournamentSummaryParser:  # pylint: disable=too-many-public-methods
     # ------------------------------------------------------------------
 
     def __repr__(self) -> str:  # pragma: no cover
-        return f"<TournamentSummaryParser hero='{self.hero_name}'>"
\ No newline at end of file
+        return f"<TournamentSummaryParser hero='{self.hero_name}'>"
+
+# ---------------------------------------------------------------------------
+# Process-pool entry point
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=1)
+def _process_parser() -> TournamentSummaryParser:
+    """Парсер, создаваемый один раз на процесс и переиспользуемый между файлами."""
+    return TournamentSummaryParser(hero_name="Hero")
+
+
+def parse_summary_file(
+    file_path: str, max_finish_place: Optional[int] = None
+) -> tuple[str, Optional[TournamentSummary], Optional[str]]:
+    """Разбирает TS‑файл в дочернем процессе (функция модуля, поэтому picklable).
+
+    Исключения не пробрасываются: ``ProcessPoolExecutor.map`` прервал бы
+    весь пакет на первом же битом файле.
+
+    Parameters
+    ----------
+    max_finish_place : Optional[int]
+        Если задано, место героя сначала определяется через
+        :meth:`TournamentSummaryParser.quick_finish_place`, и файлы с местом
+        больше этого значения не разбираются полностью.
+
+    Returns
+    -------
+    tuple
+        ``(file_path, summary, error)`` — либо результат, либо текст ошибки;
+        ``(file_path, None, None)`` для файлов, отсеянных по месту.
+    """
+    try:
+        parser = _process_parser()
+        if max_finish_place is not None:
+            finish_place = parser.quick_finish_place(file_path)
+            if finish_place is not None and finish_place > max_finish_place:
+                return file_path, None, None
+        return file_path, parser.parse_file(file_path), None
+    except Exception as e:  # pylint: disable=broad-except
+        return file_path, None, str(e)
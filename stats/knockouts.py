@@ -8,7 +8,6 @@
 
 from typing import Dict, List, Optional, Union, Tuple
 from collections import defaultdict
-import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 
@@ -259,6 +258,10 @@ class KnockoutsAnalyzer:
             save_path: Путь для сохранения графика (опционально)
             last_n_days: Количество последних дней для отображения (опционально)
         """
+        # matplotlib.pyplot нужен только для построения графиков и импортируется
+        # при первом вызове, а не при загрузке модуля вместе с главным окном
+        import matplotlib.pyplot as plt
+        
         if not self.db_manager or not self.db_manager.connection:
             return
             
@@ -309,6 +312,8 @@ class KnockoutsAnalyzer:
         Args:
             save_path: Путь для сохранения графика (опционально)
         """
+        import matplotlib.pyplot as plt
+        
         stats = self.get_large_knockouts_stats()
         
         labels = ['x10', 'x100', 'x1000', 'x10000']
@@ -349,6 +354,8 @@ class KnockoutsAnalyzer:
         Args:
             save_path: Путь для сохранения графика (опционально)
         """
+        import matplotlib.pyplot as plt
+        
         stats = self.get_multi_knockout_stats()
         
         labels = ['Обычные нокауты', 'Мульти-нокауты']
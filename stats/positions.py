@@ -14,6 +14,9 @@ import numpy as np
 from datetime import datetime
 from math import ceil # Импортируем ceil один раз на уровне модуля
 
+# Места 9-max, по которым строятся распределения
+_PLACES = tuple(range(1, 10))
+
 
 class PositionsAnalyzer:
     """
@@ -40,7 +43,7 @@ class PositionsAnalyzer:
             Словарь {нормализованное_место: количество_турниров}
         """
         if not self.db_manager or not self.db_manager.connection:
-            return {i: 0 for i in range(1, 10)}
+            return dict.fromkeys(_PLACES, 0)
             
         cursor = self.db_manager.connection.cursor()
         
@@ -61,7 +64,8 @@ class PositionsAnalyzer:
         
         all_tournament_results = cursor.fetchall() # Получаем список sqlite3.Row
         
-        normalized_places_counts = {i: 0 for i in range(1, 10)}
+        # Счетчики по индексу place-1; словарь собирается один раз в конце
+        places_counts = [0] * 9
         
         for row in all_tournament_results:
             place = row['finish_place']
@@ -90,9 +94,9 @@ class PositionsAnalyzer:
                 # устанавливаем последнее место (9)
                 normalized_place = 9
                 
-            normalized_places_counts[normalized_place] += 1
+            places_counts[normalized_place - 1] += 1
             
-        return normalized_places_counts
+        return dict(zip(_PLACES, places_counts))
         
     def get_average_position(self, session_id: Optional[str] = None) -> float:
         """
@@ -239,7 +243,7 @@ class PositionsAnalyzer:
             Словарь {место: средний_выигрыш}
         """
         if not self.db_manager or not self.db_manager.connection:
-            return {i: 0.0 for i in range(1, 10)}
+            return dict.fromkeys(_PLACES, 0.0)
             
         cursor = self.db_manager.connection.cursor()
         
@@ -268,7 +272,7 @@ class PositionsAnalyzer:
         cursor.execute(final_query, tuple(params))
         result = cursor.fetchall()
         
-        prize_by_position = {i: 0.0 for i in range(1, 10)}
+        prize_by_position = dict.fromkeys(_PLACES, 0.0)
         for row in result:
             place = row['finish_place']
             avg_prize = row['avg_prize']
@@ -12,6 +12,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
+from db.database import SQLITE_SIDECAR_SUFFIXES
+
 
 class DatabaseDialog(QDialog):
     """
@@ -261,8 +263,12 @@ class DatabaseDialog(QDialog):
                 if self.db_manager.current_db_path == db_path:
                     self.db_manager.close()
                     
-                # Удаляем файл
+                # Удаляем файл и файлы журнала WAL, если они остались: устаревший
+                # журнал иначе применился бы к новой базе с тем же именем
                 os.remove(db_path)
+                for suffix in SQLITE_SIDECAR_SUFFIXES:
+                    if os.path.exists(db_path + suffix):
+                        os.remove(db_path + suffix)
                 
                 # Обновляем список
                 self._load_databases()
@@ -25,96 +25,338 @@ import os
 import logging
 import re
 import sqlite3 
-import dataclasses 
+import queue
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union, Any
 
+import numpy as np
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QTabWidget, QFileDialog, QMessageBox, QProgressBar,
     QStatusBar, QSplitter, QTreeWidget, QTreeWidgetItem, QMenu,
-    QDialog, QInputDialog, QHeaderView, QTableWidget, QTableWidgetItem,
+    QDialog, QInputDialog, QHeaderView, QTableView,
     QGroupBox, QScrollArea
 )
-from PyQt6.QtCore import Qt, QThreadPool, QRunnable, pyqtSignal, pyqtSlot, QObject, QSize, QThread 
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QSize, QThread, QTimer,
+    QAbstractTableModel, QModelIndex
+)
 from PyQt6.QtGui import QAction, QIcon, QFont
 
 from db.database import DatabaseManager, StatsDatabase
 from ui.db_dialog import DatabaseDialog
 from ui.visualizations import PlaceDistributionChart, StatsGrid # Используем royal_stats_visualizations_py_v2
-from parsers.hand_history import HandHistoryParser
-from parsers.tournament_summary import TournamentSummaryParser, TournamentSummary 
+from parsers.hand_history import parse_hand_history_file
+from parsers.tournament_summary import TournamentSummary, parse_summary_file
 from stats.knockouts import KnockoutsAnalyzer
 
 # Настройка логирования
 logger = logging.getLogger('ROYAL_Stats.MainWindow') 
 
-# Сигналы для выполнения задач в отдельном потоке
-class WorkerSignals(QObject):
+# Параметры параллельного разбора файлов в пуле процессов
+PARALLEL_PARSE_MIN_FILES = 64  # меньшие пакеты разбираются без пула
+PARSE_CHUNKSIZE = 32  # файлов на одну задачу пула
+
+# Турниры с местом героя хуже этого не сохраняются
+MAX_FINISH_PLACE = 9
+
+# Сколько раз за проход обновляется прогресс-бар
+PROGRESS_UPDATES = 200
+# Шаг прогресса, пока общее количество файлов еще неизвестно (обход папки)
+UNKNOWN_TOTAL_PROGRESS_STEP = 50
+
+# Сколько секунд ждать, пока фоновый поток закроет соединение перед диалогом выбора БД
+DB_RELEASE_TIMEOUT = 10
+
+# Маркеры для определения типа файла (скомпилированы один раз, без .lower() на каждый файл)
+_BUY_IN_MARKER_RE = re.compile(r'buy', re.IGNORECASE)
+_HAND_HISTORY_NAME_RE = re.compile(r'9max', re.IGNORECASE)
+
+
+
+@lru_cache(maxsize=8192)
+def _format_start_time(start_time_str: Optional[str]) -> str:
     """
-    Сигналы для WorkerThread.
+    Форматирует время начала турнира для таблицы.
+
+    Время турниров одной сессии часто повторяется с точностью до минуты,
+    поэтому результат кэшируется и strptime выполняется один раз на строку.
+    Для строк вида 'YYYY-MM-DD HH:MM:SS[.ffffff]' результат - просто первые
+    16 символов, и разбор не нужен вовсе.
     """
-    started = pyqtSignal()
-    finished = pyqtSignal()
-    progress = pyqtSignal(int, int)  # Добавлен второй параметр для общего количества
-    error = pyqtSignal(str)
-    result = pyqtSignal(object)
-    cancel = pyqtSignal()  # Новый сигнал для отмены операции
+    if not start_time_str or start_time_str == 'N/A':
+        return 'N/A'
+    if (len(start_time_str) >= 19 and start_time_str[4] == '-' and start_time_str[7] == '-'
+            and start_time_str[10] == ' ' and start_time_str[13] == ':' and start_time_str[16] == ':'):
+        return start_time_str[:16]
+    for fmt in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(start_time_str, fmt).strftime('%Y-%m-%d %H:%M')
+        except ValueError:
+            continue
+    return start_time_str
 
 
-class Worker(QRunnable):
+def _normalized_places_distribution(place_groups: List[Tuple[int, int, int]]) -> np.ndarray:
     """
-    Класс для выполнения задач в отдельном потоке.
+    Строит распределение нормализованных мест по группам (место, игроки, количество).
+
+    Место линейно масштабируется из диапазона [1, players_count] в [1, 9]:
+    round((place - 1) * 8 / (players_count - 1) + 1). np.rint, как и round,
+    округляет половины к четному, поэтому результат совпадает с поэлементным расчетом.
     """
-    
-    def __init__(self, fn, *args, **kwargs):
-        super().__init__()
-        
-        self.fn = fn
-        self.args = args
-        self.kwargs = kwargs 
-        self.signals = WorkerSignals()
-        self.is_cancelled = False  # Флаг отмены операции
-        
-        self.worker_logger = logging.getLogger('ROYAL_Stats.Worker') 
-        
-    @pyqtSlot()
-    def run(self):
+    groups = np.array(place_groups, dtype=np.int64).reshape(-1, 3)
+    places, players_counts, counts = groups.T
+    normalized = np.ones(len(places), dtype=np.int64)
+    # При одном игроке место всегда первое
+    multi = players_counts > 1
+    normalized[multi] = np.rint((places[multi] - 1) * 8 / (players_counts[multi] - 1) + 1)
+    np.clip(normalized, 1, 9, out=normalized)
+    return np.bincount(normalized - 1, weights=counts, minlength=9).astype(np.int64)
+
+
+def _format_money(value: Optional[float]) -> str:
+    """ Форматирует денежную сумму для таблицы. """
+    return f"${value:.2f}" if value is not None else 'N/A'
+
+
+def _format_count(value: Optional[int]) -> str:
+    """ Форматирует количество для таблицы (NULL отображается как 0). """
+    return str(value if value is not None else 0)
+
+
+# Количество строк, которое модель таблицы турниров отдает представлению за раз
+TOURNAMENT_TABLE_FETCH_SIZE = 1000
+
+# Столбцы таблицы турниров: заголовок, поле строки турнира и форматирование
+TOURNAMENT_TABLE_COLUMNS = [
+    ("ID турнира", 'tournament_id', str),
+    ("Buy-in", 'buy_in', _format_money),
+    ("Место", 'finish_place', str),
+    ("Выигрыш", 'prize', _format_money),
+    ("Нокаутов", 'knockouts_count', str),
+    ("x10 Нокауты", 'knockouts_x10', _format_count),
+    ("Дата", 'start_time', _format_start_time),
+]
+
+# Выборка турниров для таблицы: только отображаемые столбцы, в порядке столбцов таблицы
+TOURNAMENT_TABLE_SELECT = "SELECT {} FROM tournaments".format(
+    ", ".join(key for _, key, _ in TOURNAMENT_TABLE_COLUMNS)
+)
+
+
+def _iter_txt_files(root: str):
+    """
+    Рекурсивно перечисляет .txt файлы в папке.
+
+    os.scandir возвращает тип записи вместе с именем, поэтому обход не делает
+    отдельный stat() на каждый файл. Недоступные папки пропускаются, как и в os.walk.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_txt_files(entry.path)
+                elif entry.name.endswith('.txt'):
+                    yield entry.path
+    except OSError as e:
+        logger.warning(f"Не удалось прочитать папку {root}: {str(e)}")
+
+
+class TournamentTableModel(QAbstractTableModel):
+    """
+    Модель таблицы турниров для QTableView.
+
+    Хранит строки турниров (sqlite3.Row, столбцы в порядке TOURNAMENT_TABLE_COLUMNS)
+    как есть и форматирует значения только для тех ячеек, которые представление
+    действительно отрисовывает, вместо создания QTableWidgetItem на каждую ячейку.
+
+    Представлению строки отдаются порциями по TOURNAMENT_TABLE_FETCH_SIZE
+    (canFetchMore/fetchMore): следующая порция подгружается при прокрутке
+    к концу таблицы, поэтому большая выборка не раскладывается целиком.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[sqlite3.Row] = []
+        self._loaded_count = 0
+
+    def set_rows(self, rows: List[sqlite3.Row]):
+        """ Заменяет содержимое модели одним сбросом. """
+        self.beginResetModel()
+        self._rows = rows
+        self._loaded_count = min(len(rows), TOURNAMENT_TABLE_FETCH_SIZE)
+        self.endResetModel()
+
+    def clear(self):
+        """ Очищает модель. """
+        self.set_rows([])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded_count
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded_count < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(len(self._rows) - self._loaded_count, TOURNAMENT_TABLE_FETCH_SIZE)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_count, self._loaded_count + count - 1)
+        self._loaded_count += count
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(TOURNAMENT_TABLE_COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            column = index.column()
+            return TOURNAMENT_TABLE_COLUMNS[column][2](self._rows[index.row()][column])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return TOURNAMENT_TABLE_COLUMNS[section][0]
+        return super().headerData(section, orientation, role)
+
+
+class IngestJob(NamedTuple):
+    """ Задание на загрузку файлов в сессию (пути - список или генератор). """
+    file_paths: Iterable[str]
+    session_id: str
+
+
+class ReopenJob(NamedTuple):
+    """
+    Задание на переключение базы данных фонового потока (None - закрыть).
+    Событие done, если задано, устанавливается после переключения соединения.
+    """
+    db_path: Optional[str]
+    done: Optional[threading.Event] = None
+
+
+class IngestThread(QThread):
+    """
+    Долгоживущий фоновый поток загрузки файлов.
+
+    Задания выполняются по очереди из queue.Queue. Соединение с БД открывается
+    один раз на базу данных и переиспользуется между загрузками, поэтому
+    открытие SQLite и прогрев кэша страниц не повторяются на каждый запуск.
+    Соединение создается, используется и закрывается только в этом потоке.
+    """
+    job_started = pyqtSignal()
+    job_finished = pyqtSignal()
+    progress = pyqtSignal(int, int)  # текущее значение и общее количество
+    error = pyqtSignal(str)
+    result = pyqtSignal(object)
+
+    def __init__(self, db_folder: str, process_fn, parent=None):
         """
-        Выполняет функцию в отдельном потоке.
+        Args:
+            db_folder: Папка с базами данных
+            process_fn: Функция обработки файлов (см. MainWindow.process_files)
+        """
+        super().__init__(parent)
+        self.queue: "queue.Queue[Optional[Union[IngestJob, ReopenJob]]]" = queue.Queue()
+        self._process_fn = process_fn
+        self._db_manager = DatabaseManager(db_folder=db_folder)
+        self._stats_db = None
+        self._cancel_event = threading.Event()
+        self.worker_logger = logging.getLogger('ROYAL_Stats.Worker')
+
+    def submit(self, job: IngestJob):
         """
+        Ставит задание загрузки в очередь.
+
+        Флаг отмены сбрасывается при постановке в очередь, а не при запуске
+        задания: отмена, запрошенная пока задание ждет в очереди, не теряется.
+        """
+        self._cancel_event.clear()
+        self.queue.put(job)
+
+    def cancel(self):
+        """ Отменяет текущее задание загрузки. """
+        self._cancel_event.set()
+        self.worker_logger.debug("Запрошена отмена загрузки файлов")
+
+    def stop(self):
+        """ Отменяет текущее задание и завершает поток после него. """
+        self._cancel_event.set()
+        self.queue.put(None)
+
+    def run(self):
+        """ Выполняет задания из очереди до получения None. """
         try:
-            self.signals.started.emit()
-            self.worker_logger.debug(f"Worker начал выполнение функции {self.fn.__name__}")
-            
-            current_kwargs = self.kwargs.copy()
-            current_kwargs['worker_signals'] = self.signals
-            current_kwargs['is_cancelled'] = lambda: self.is_cancelled  # Добавляем проверку на отмену
-            
-            result = self.fn(*self.args, **current_kwargs)
-            
-            if not self.is_cancelled:
-                self.signals.result.emit(result)
-                self.worker_logger.debug(f"Worker успешно выполнил функцию {self.fn.__name__}")
+            while True:
+                job = self.queue.get()
+                if job is None:
+                    break
+                if isinstance(job, ReopenJob):
+                    try:
+                        self._reopen(job.db_path)
+                    finally:
+                        if job.done is not None:
+                            job.done.set()
+                else:
+                    self._ingest(job)
+        finally:
+            self._close()
+
+    def _reopen(self, db_path: Optional[str]):
+        """ Переключает соединение потока на другую базу данных. """
+        self._close()
+        if not db_path:
+            return
+        try:
+            self._db_manager.connect(db_path)
+            self._db_manager.enable_bulk_insert_mode()
+            self._stats_db = StatsDatabase(self._db_manager)
+            self.worker_logger.debug(f"Фоновый поток подключен к БД: {db_path}")
+        except Exception as e:
+            self.worker_logger.error(f"Не удалось подключить фоновый поток к БД {db_path}: {str(e)}", exc_info=True)
+            self._stats_db = None
+
+    def _close(self):
+        """ Закрывает соединение потока с базой данных. """
+        self._stats_db = None
+        if not self._db_manager.connection:
+            return
+        try:
+            self._db_manager.disable_bulk_insert_mode()
+        except Exception as e:
+            self.worker_logger.warning(f"Не удалось восстановить PRAGMA synchronous: {str(e)}")
+        self._db_manager.close()
+
+    def _ingest(self, job: IngestJob):
+        """ Выполняет загрузку файлов и сообщает результат сигналами. """
+        self.job_started.emit()
+        self.worker_logger.debug(f"Начата загрузка файлов в сессию {job.session_id}")
+        try:
+            if not self._stats_db:
+                raise Exception("База данных не подключена в фоновом потоке загрузки.")
+            results = self._process_fn(
+                job.file_paths, job.session_id,
+                stats_db_instance=self._stats_db,
+                progress_signal=self.progress,
+                is_cancelled=self._cancel_event.is_set
+            )
+            if not self._cancel_event.is_set():
+                self.result.emit(results)
             else:
-                self.worker_logger.debug(f"Worker был отменен для функции {self.fn.__name__}")
-            
+                self.worker_logger.debug("Загрузка файлов отменена")
         except Exception as e:
-            self.worker_logger.error(f"Ошибка в Worker при выполнении {self.fn.__name__}: {str(e)}", 
-                            exc_info=True)
-            self.signals.error.emit(str(e))
-            
+            self.worker_logger.error(f"Ошибка в фоновом потоке загрузки: {str(e)}", exc_info=True)
+            self.error.emit(str(e))
         finally:
-            self.signals.finished.emit()
-            self.worker_logger.debug(f"Worker завершил выполнение функции {self.fn.__name__}")
-    
-    def cancel(self):
-        """
-        Отмена выполнения задачи.
-        """
-        self.is_cancelled = True
-        self.signals.cancel.emit()  # Отправляем сигнал об отмене
-        self.worker_logger.debug(f"Запрошена отмена для функции {self.fn.__name__}")
+            self.job_finished.emit()
 
 
 class MainWindow(QMainWindow):
@@ -128,15 +370,26 @@ class MainWindow(QMainWindow):
         self.db_manager = DatabaseManager(db_folder='databases')
         self.stats_db = None 
         
-        self.hand_history_parser = HandHistoryParser()
-        self.tournament_summary_parser = TournamentSummaryParser(hero_name="Hero") 
-        
-        self.threadpool = QThreadPool()
-        logger.info(f"Максимальное количество потоков в пуле: {self.threadpool.maxThreadCount()}")
+        # Фоновый поток загрузки создается один раз на все время работы окна
+        self.ingest_thread = IngestThread(self.db_manager.db_folder, self.process_files, self)
+        self.ingest_thread.job_started.connect(lambda: self.status_bar.showMessage("Обработка файлов началась..."))
+        self.ingest_thread.job_finished.connect(self.on_files_processing_finished)
+        self.ingest_thread.error.connect(self.on_files_processing_error)
+        self.ingest_thread.result.connect(self.on_files_processing_result)
+        self.ingest_thread.progress.connect(self.update_progress)
+        self.ingest_thread.start()
         
         self.current_session_id = None
         self.current_db_path = None 
-        self.current_worker = None  # Для хранения ссылки на текущий Worker
+        self.is_processing = False  # Выполняется ли загрузка файлов
+        
+        # Кэш рассчитанной статистики: {session_id или None для всех сессий:
+        # (статистика, распределение мест)}. Пустой кэш означает, что данные
+        # изменились и статистику нужно пересчитать.
+        self._stats_cache: Dict[Optional[str], Tuple[Dict, np.ndarray]] = {}
+        # Сессия, данные которой сейчас показаны; повторный выбор той же сессии
+        # без изменения данных ничего не пересчитывает
+        self._last_selected_id: Optional[str] = None
         
         self._init_ui()
         self.show_database_dialog()
@@ -196,11 +449,9 @@ class MainWindow(QMainWindow):
         self.tournaments_tab = QWidget()
         tournaments_layout = QVBoxLayout(self.tournaments_tab)
         
-        self.tournaments_table = QTableWidget()
-        self.tournaments_table.setColumnCount(7)
-        self.tournaments_table.setHorizontalHeaderLabels([
-            "ID турнира", "Buy-in", "Место", "Выигрыш", "Нокаутов", "x10 Нокауты", "Дата"
-        ])
+        self.tournaments_model = TournamentTableModel(self)
+        self.tournaments_table = QTableView()
+        self.tournaments_table.setModel(self.tournaments_model)
         self.tournaments_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         tournaments_layout.addWidget(self.tournaments_table)
         
@@ -276,7 +527,7 @@ class MainWindow(QMainWindow):
         tools_menu = self.menuBar().addMenu("Инструменты")
         
         update_stats_action = QAction("Обновить статистику", self)
-        update_stats_action.triggered.connect(self.update_statistics)
+        update_stats_action.triggered.connect(self.refresh_statistics)
         tools_menu.addAction(update_stats_action)
         
         clear_data_action = QAction("Очистить все данные", self)
@@ -287,17 +538,30 @@ class MainWindow(QMainWindow):
         """
         Отменяет текущую операцию загрузки файлов.
         """
-        if self.current_worker:
-            self.current_worker.cancel()
+        if self.is_processing:
+            self.ingest_thread.cancel()
             self.status_bar.showMessage("Загрузка отменена пользователем", 5000)
         
     def show_database_dialog(self):
         """
         Показывает диалог выбора базы данных.
         """
+        if self.is_processing:
+            QMessageBox.warning(self, "Предупреждение", "Дождитесь завершения загрузки файлов или отмените ее.")
+            return
+        
+        # Фоновый поток отпускает базу на время диалога, чтобы ее можно было удалить;
+        # после диалога он подключается к текущей базе (возможно, новой).
+        # Диалог открывается только после того, как поток закрыл соединение.
+        released = threading.Event()
+        self.ingest_thread.queue.put(ReopenJob(None, released))
+        if not released.wait(DB_RELEASE_TIMEOUT):
+            logger.warning("Фоновый поток не освободил базу данных до открытия диалога")
         dialog = DatabaseDialog(self.db_manager, self)
         dialog.db_selected.connect(self.on_database_selected)
         dialog.exec()
+        if self.current_db_path and os.path.exists(self.current_db_path):
+            self.ingest_thread.queue.put(ReopenJob(self.current_db_path))
         
     def on_database_selected(self, db_path: str):
         """
@@ -312,6 +576,7 @@ class MainWindow(QMainWindow):
         try:
             self.db_manager.connect(self.current_db_path) 
             self.stats_db = StatsDatabase(self.db_manager)
+            self._invalidate_stats_cache()
             
             self.load_sessions()
             self.update_statistics()
@@ -331,12 +596,14 @@ class MainWindow(QMainWindow):
             logger.warning("Попытка загрузить сессии без инициализированного self.stats_db")
             return
             
-        self.sessions_tree.clear()
-        
         all_sessions_item = QTreeWidgetItem(["Все сессии"])
         all_sessions_item.setData(0, Qt.ItemDataRole.UserRole, "all")
-        self.sessions_tree.addTopLevelItem(all_sessions_item)
+        items = [all_sessions_item]
         
+        # Дерево заполняется одним вызовом addTopLevelItems при отключенной
+        # перерисовке: одна перекомпоновка вместо одной на каждую сессию
+        self.sessions_tree.setUpdatesEnabled(False)
+        self.sessions_tree.clear()
         try:
             sessions = self.stats_db.get_sessions()
             for session in sessions:
@@ -345,16 +612,32 @@ class MainWindow(QMainWindow):
                 item_text = f"{session_name} ({session.get('tournaments_count', 0)} турниров)"
                 session_item = QTreeWidgetItem([item_text])
                 session_item.setData(0, Qt.ItemDataRole.UserRole, session_id)
-                self.sessions_tree.addTopLevelItem(session_item)
+                items.append(session_item)
                 
-            self.sessions_tree.expandAll()
-            if self.sessions_tree.topLevelItemCount() > 0:
-                 self.sessions_tree.setCurrentItem(all_sessions_item)
-                 self.on_session_selected(all_sessions_item, 0)
+            self.sessions_tree.addTopLevelItems(items)
+            # Раскрытие и выбор откладываются до возврата в цикл событий: если
+            # вызывающий код сам выберет сессию, "Все сессии" не пересчитываются зря
+            QTimer.singleShot(0, self._finalize_session_tree)
 
         except Exception as e:
+            if self.sessions_tree.topLevelItemCount() == 0:
+                self.sessions_tree.addTopLevelItem(all_sessions_item)
             logger.error(f"Не удалось загрузить сессии: {str(e)}", exc_info=True)
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить сессии: {str(e)}")
+        finally:
+            self.sessions_tree.setUpdatesEnabled(True)
+            
+    def _finalize_session_tree(self):
+        """
+        Раскрывает дерево сессий и выбирает "Все сессии", если ничего не выбрано.
+        """
+        if self.sessions_tree.topLevelItemCount() == 0:
+            return
+        self.sessions_tree.expandAll()
+        if self.sessions_tree.currentItem() is None:
+            all_sessions_item = self.sessions_tree.topLevelItem(0)
+            self.sessions_tree.setCurrentItem(all_sessions_item)
+            self.on_session_selected(all_sessions_item, 0)
             
     def on_session_selected(self, item: QTreeWidgetItem, column: int = 0):
         """
@@ -364,6 +647,9 @@ class MainWindow(QMainWindow):
             return
 
         session_id = item.data(0, Qt.ItemDataRole.UserRole)
+        if session_id == self._last_selected_id:
+            return
+        self._last_selected_id = session_id
         
         if session_id == "all":
             self.current_session_id = None
@@ -414,11 +700,7 @@ class MainWindow(QMainWindow):
         
         if ok and new_name:
             try:
-                self.db_manager.cursor.execute(
-                    "UPDATE sessions SET session_name = ? WHERE session_id = ?",
-                    (new_name, session_id)
-                )
-                self.db_manager.connection.commit()
+                self.stats_db.rename_session(session_id, new_name)
                 self.load_sessions()
                 self.status_bar.showMessage(f"Сессия успешно переименована")
             except Exception as e:
@@ -441,6 +723,7 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             try:
                 self.stats_db.delete_session(session_id)
+                self._invalidate_stats_cache()
                 self.load_sessions() 
                 if self.current_session_id == session_id:
                     self.current_session_id = None
@@ -540,11 +823,9 @@ class MainWindow(QMainWindow):
             if dialog.exec():
                 nonlocal file_paths_to_process
                 selected_folder = dialog.selectedFiles()[0]
-                # Рекурсивно обходим папку и ищем все .txt файлы
-                for root, _, files in os.walk(selected_folder):
-                    for file in files:
-                        if file.endswith('.txt'):
-                            file_paths_to_process.append(os.path.join(root, file))
+                # Папка обходится лениво в фоновом потоке вместе с первым проходом
+                # по файлам, без предварительного построения полного списка
+                file_paths_to_process = _iter_txt_files(selected_folder)
                 choice_dialog_result[0] = True
                 choice_dialog.accept()
         
@@ -557,6 +838,13 @@ class MainWindow(QMainWindow):
         # Если выбор не был сделан или список файлов пуст, выходим
         if not choice_dialog_result[0] or not file_paths_to_process:
             return
+        if not isinstance(file_paths_to_process, list):
+            # Генератор обхода папки всегда истинен: берем первый файл, чтобы
+            # не создавать сессию для папки без .txt файлов
+            first_path = next(file_paths_to_process, None)
+            if first_path is None:
+                return
+            file_paths_to_process = chain((first_path,), file_paths_to_process)
         
         session_id_for_processing = self.current_session_id
         if not session_id_for_processing or session_id_for_processing == "all":
@@ -566,76 +854,38 @@ class MainWindow(QMainWindow):
         
         # Настраиваем прогресс-бар и связанные элементы
         self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(file_paths_to_process)) 
         self.progress_bar.setValue(0)
-        
-        self.progress_label.setText(f"Обработано 0 из {len(file_paths_to_process)} файлов")
+        if isinstance(file_paths_to_process, list):
+            self.progress_bar.setMaximum(len(file_paths_to_process))
+            self.progress_label.setText(f"Обработано 0 из {len(file_paths_to_process)} файлов")
+        else:
+            # Количество файлов в папке станет известно только после обхода
+            self.progress_bar.setMaximum(0)
+            self.progress_label.setText("Поиск файлов...")
         self.progress_label.setVisible(True)
         
         self.cancel_button.setVisible(True)
         self.load_files_button.setEnabled(False)
         
-        # Создаем и запускаем Worker
-        worker = Worker(self._process_files_worker, file_paths_to_process, session_id_for_processing)
-        self.current_worker = worker  # Сохраняем ссылку на текущий Worker
-        
-        worker.signals.started.connect(lambda: self.status_bar.showMessage("Обработка файлов началась..."))
-        worker.signals.finished.connect(self.on_files_processing_finished)
-        worker.signals.error.connect(self.on_files_processing_error)
-        worker.signals.result.connect(self.on_files_processing_result)
-        
-        # Обновляем обработчик прогресса для поддержки двух параметров (текущий и общий)
-        worker.signals.progress.connect(self.update_progress) 
-        
-        # Запускаем Worker
-        self.threadpool.start(worker)
+        # Передаем задание фоновому потоку загрузки
+        self.is_processing = True
+        self.ingest_thread.submit(IngestJob(file_paths_to_process, session_id_for_processing))
         
     def update_progress(self, value, total):
         """
         Обновляет прогресс-бар и метку прогресса.
         """
         if self.progress_bar.isVisible():
+            # total == 0 - общее количество файлов еще неизвестно
+            if not total:
+                self.progress_label.setText(f"Найдено {value} файлов...")
+                return
+            if self.progress_bar.maximum() != total:
+                self.progress_bar.setMaximum(total)
             self.progress_bar.setValue(value)
             self.progress_label.setText(f"Обработано {value} из {total} файлов")
         
-    def _process_files_worker(self, file_paths: List[str], session_id: str, 
-                             worker_signals: WorkerSignals, is_cancelled: callable):
-        """
-        Функция для обработки файлов в отдельном потоке.
-        """
-        worker_logger = logging.getLogger('ROYAL_Stats.Worker') 
-        worker_logger.debug(f"Worker thread ({QThread.currentThreadId()}) for session {session_id} started processing {len(file_paths)} files.")
-        
-        worker_db_manager = DatabaseManager(db_folder=self.db_manager.db_folder)
-        worker_stats_db = None
-        try:
-            if not self.current_db_path: 
-                err_msg = "Путь к базе данных не установлен перед запуском worker."
-                worker_logger.error(err_msg)
-                raise Exception(err_msg) 
-            
-            worker_logger.debug(f"Worker connecting to DB: {self.current_db_path}")
-            worker_db_manager.connect(self.current_db_path)
-            worker_stats_db = StatsDatabase(worker_db_manager)
-            worker_logger.debug(f"Worker DB connection successful.")
-            
-            results = self.process_files(file_paths, session_id, 
-                                         stats_db_instance=worker_stats_db, 
-                                         progress_signal=worker_signals.progress,
-                                         is_cancelled=is_cancelled)
-            worker_logger.debug(f"Worker processing finished. Results: {results}")
-            return results
-        except Exception as e:
-            worker_logger.error(f"Критическая ошибка в _process_files_worker: {str(e)}", exc_info=True)
-            raise 
-        finally:
-            if worker_db_manager:
-                worker_logger.debug(f"Worker closing DB connection.")
-                worker_db_manager.close()
-            worker_logger.debug(f"Worker thread ({QThread.currentThreadId()}) finished.")
-
-        
-    def process_files(self, file_paths: List[str], session_id: str, 
+    def process_files(self, file_paths: Iterable[str], session_id: str, 
                       stats_db_instance: StatsDatabase, 
                       progress_signal: Optional[pyqtSignal] = None,
                       is_cancelled: callable = None):
@@ -643,7 +893,7 @@ class MainWindow(QMainWindow):
         Обрабатывает файлы истории рук и сводки турниров.
         
         Args:
-            file_paths: Список путей к файлам
+            file_paths: Список или генератор путей к файлам
             session_id: ID сессии загрузки
             stats_db_instance: Экземпляр StatsDatabase
             progress_signal: Сигнал для обновления прогресса
@@ -662,42 +912,69 @@ class MainWindow(QMainWindow):
         hand_history_files = []
         tournament_summary_files = []
         
-        total_files = len(file_paths)
+        # Для генератора путей общее количество известно только после первого
+        # прохода, до этого прогресс отправляется с total_files == 0
+        total_files = len(file_paths) if hasattr(file_paths, '__len__') else 0
         processed_files = 0
         
+        # Каждый emit пересекает границу потоков и перерисовывает прогресс-бар,
+        # поэтому прогресс отправляется примерно PROGRESS_UPDATES раз за проход
+        if total_files:
+            progress_step = max(1, total_files // PROGRESS_UPDATES)
+        else:
+            progress_step = UNKNOWN_TOTAL_PROGRESS_STEP
+        
+        # Файлы, уже загруженные с тем же mtime и размером, не разбираются повторно
+        parsed_files_cache = current_stats_db.get_parsed_files()
+        file_keys = {}
+        skipped_cached_files = 0
+        
         # Первый проход: определяем типы файлов
         for file_path in file_paths:
             if is_cancelled and is_cancelled():
                 return {'cancelled': True, 'processed_files': processed_files, 'total_files': total_files}
                 
-            file_name = os.path.basename(file_path)
-            
             # Проверяем содержимое файла для более точного определения
             try:
+                st = os.stat(file_path)
+                file_key = (st.st_mtime, st.st_size)
+                if parsed_files_cache.get(file_path) == file_key:
+                    skipped_cached_files += 1
+                    logger.debug(f"Файл уже загружен ранее, пропускаем: {file_path}")
+                    continue
+                file_keys[file_path] = file_key
+                
                 with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                     content = f.read(2000)  # Читаем первые 2000 байт для определения типа
                     
-                    # Улучшенное определение файлов tournament summary
+                    # Улучшенное определение файлов tournament summary.
+                    # Маркеры 'st place', 'nd place' и т.п. содержат 'place',
+                    # а 'Poker Hand #' содержит 'Hand #', поэтому достаточно одной проверки
                     if ('Tournament #' in content and 
-                        ('Buy' in content or 'buy' in content.lower()) and 
-                        (any(marker in content for marker in ['place', 'st place', 'nd place', 'rd place', 'th place']))):
+                        _BUY_IN_MARKER_RE.search(content) and 
+                        'place' in content):
                         tournament_summary_files.append(file_path)
                         logger.debug(f"Определен файл сводки турнира: {file_path}")
                     # Улучшенное определение файлов hand history - не только по '9max' в имени
-                    elif ('Hand #' in content or 'Poker Hand #' in content or 
+                    elif ('Hand #' in content or 
                           'Table' in content and 'Seat' in content or
-                          '9max' in file_name.lower()):  # Сохраняем поддержку старого формата имени
+                          _HAND_HISTORY_NAME_RE.search(os.path.basename(file_path))):  # Сохраняем поддержку старого формата имени
                         hand_history_files.append(file_path)
                         logger.debug(f"Определен файл истории рук: {file_path}")
                     else:
                         logger.info(f"Неопознанный тип файла, пропускаем: {file_path}")
             except Exception as e:
                 logger.warning(f"Не удалось прочитать файл {file_path}: {str(e)}")
+            finally:
+                processed_files += 1
+                if progress_signal and processed_files % progress_step == 0:
+                    progress_signal.emit(processed_files, total_files)
+        
+        total_files = processed_files
+        progress_step = max(1, total_files // PROGRESS_UPDATES)
+        if progress_signal:
+            progress_signal.emit(processed_files, total_files)
             
-            processed_files += 1
-            if progress_signal:
-                progress_signal.emit(processed_files, total_files)
-                
         results = {
             'total_files': total_files,
             'tournament_summary_files_found': len(tournament_summary_files), 
@@ -705,125 +982,178 @@ class MainWindow(QMainWindow):
             'processed_tournaments': 0,
             'processed_knockouts': 0,
             'skipped_tournaments_high_finish_place': 0, 
+            'skipped_cached_files': skipped_cached_files,
             'errors': []
         }
         
         logger.info(f"Найдено файлов сводки турниров: {len(tournament_summary_files)}")
         logger.info(f"Найдено файлов истории рук: {len(hand_history_files)}")
+        if skipped_cached_files:
+            logger.info(f"Пропущено ранее загруженных файлов: {skipped_cached_files}")
 
-        # Обрабатываем файлы сводки турниров
-        for idx, file_path in enumerate(tournament_summary_files):
-            if is_cancelled and is_cancelled():
-                results['cancelled'] = True
-                return results
-                
-            try:
-                logger.debug(f"Парсинг файла сводки турнира: {file_path}")
-                tournament_data_obj = self.tournament_summary_parser.parse_file(file_path)
-                
-                # Проверяем finish_place перед сохранением
-                if tournament_data_obj.finish_place >= 10:
-                    logger.info(f"Турнир {tournament_data_obj.tournament_id} из файла {file_path} пропущен (finish_place: {tournament_data_obj.finish_place} >= 10).")
-                    results['skipped_tournaments_high_finish_place'] += 1
-                    continue # Переходим к следующему файлу
-
-                if isinstance(tournament_data_obj, TournamentSummary):
-                    data_to_save = dataclasses.asdict(tournament_data_obj)
-                else: 
-                    data_to_save = tournament_data_obj.__dict__ if hasattr(tournament_data_obj, '__dict__') else dict(tournament_data_obj)
-
-                # Сохраняем информацию о турнире
-                current_stats_db.save_tournament_data(data_to_save, session_id)
-                results['processed_tournaments'] += 1
-                logger.debug(f"Успешно обработан файл сводки: {file_path}")
-                
-                # Обновляем прогресс
-                if progress_signal:
-                    progress_value = len(tournament_summary_files) + idx + 1
-                    progress_signal.emit(progress_value, total_files)
-                    
-            except Exception as e:
-                err_msg = f"Ошибка при обработке файла сводки {file_path}: {str(e)}"
-                logger.error(err_msg, exc_info=True)
-                results['errors'].append(err_msg)
-        
-        # Словарь для хранения среднего стека по турнирам
-        tournament_avg_stacks = {}
+        # Парсинг — чистый Python и упирается в GIL, поэтому файлы разбираются
+        # в пуле процессов. Запись в БД остается в этом потоке: у SQLite
+        # может быть только один писатель. Для небольших пакетов запуск
+        # процессов дороже самого парсинга, поэтому они разбираются здесь же.
+        parse_executor = None
+        if len(tournament_summary_files) + len(hand_history_files) >= PARALLEL_PARSE_MIN_FILES:
+            # spawn вместо fork (по умолчанию в Linux): fork из потока многопоточного
+            # Qt-процесса может зависнуть; в Windows spawn используется и так
+            parse_executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        parse_map = partial(parse_executor.map, chunksize=PARSE_CHUNKSIZE) if parse_executor else map
         
-        # Обрабатываем файлы истории рук
-        for idx, file_path in enumerate(hand_history_files):
-            if is_cancelled and is_cancelled():
-                results['cancelled'] = True
-                return results
-                
-            try:
-                logger.debug(f"Парсинг файла истории рук: {file_path}")
-                hand_history_data = self.hand_history_parser.parse_file(file_path) 
-                
-                # Если есть ID турнира и нокауты
-                if hand_history_data.get('tournament_id') and hand_history_data.get('knockouts'):
-                    # Сохраняем нокауты в базу
-                    current_stats_db.save_knockouts_data(
-                        hand_history_data['tournament_id'],
-                        hand_history_data['knockouts'],
-                        session_id
-                    )
-                    results['processed_knockouts'] += len(hand_history_data['knockouts'])
+        try:
+            # Файлы, данные которых сохранены в БД, попадают в кэш загруженных файлов
+            parsed_file_rows = []
+            
+            # Методы, вызываемые в циклах на каждый файл, связываем один раз
+            append_error = results['errors'].append
+            tournament_row = current_stats_db.tournament_row
+            summary_row = current_stats_db.summary_row
+            knockout_row = current_stats_db.knockout_row
+            
+            # Обрабатываем файлы сводки турниров: сначала разбираем все файлы,
+            # затем сохраняем результат одной транзакцией
+            summary_rows = []
+            summary_file_rows = []
+            append_summary_row = summary_rows.append
+            append_summary_file_row = summary_file_rows.append
+            # Файлы с местом хуже MAX_FINISH_PLACE отсеиваются в парсере
+            # по быстрому поиску места, без полного разбора
+            parsed_summaries = parse_map(
+                partial(parse_summary_file, max_finish_place=MAX_FINISH_PLACE), tournament_summary_files
+            )
+            for idx, (file_path, tournament_data_obj, parse_error) in enumerate(parsed_summaries):
+                if is_cancelled and is_cancelled():
+                    results['cancelled'] = True
+                    return results
                     
-                    # Сохраняем средний начальный стек
-                    tournament_id = hand_history_data['tournament_id']
-                    avg_stack = hand_history_data.get('average_initial_stack', 0)
+                try:
+                    if parse_error:
+                        raise ValueError(parse_error)
                     
-                    # Обновляем средний стек для этого турнира
-                    if avg_stack > 0:
-                        # Обновляем средний стек для турнира в базе данных
-                        try:
-                            # Проверяем, существует ли турнир в базе
-                            self.db_manager.cursor.execute(
-                                "SELECT id FROM tournaments WHERE tournament_id = ? AND session_id = ?",
-                                (tournament_id, session_id)
-                            )
-                            tournament_exists = self.db_manager.cursor.fetchone()
-                            
-                            if tournament_exists:
-                                # Обновляем средний стек для существующего турнира
-                                self.db_manager.cursor.execute(
-                                    "UPDATE tournaments SET average_initial_stack = ? WHERE tournament_id = ? AND session_id = ?",
-                                    (avg_stack, tournament_id, session_id)
-                                )
-                                self.db_manager.connection.commit()
-                                logger.debug(f"Обновлен средний стек ({avg_stack}) для турнира {tournament_id}")
-                            else:
-                                # Сохраняем информацию о среднем стеке для использования при создании турнира позже
-                                tournament_avg_stacks[tournament_id] = avg_stack
-                                logger.debug(f"Сохранен средний стек ({avg_stack}) для будущего турнира {tournament_id}")
-                        except Exception as e:
-                            logger.error(f"Ошибка при обновлении среднего стека для турнира {tournament_id}: {str(e)}", exc_info=True)
-                            
-                logger.debug(f"Успешно обработан файл истории рук: {file_path}")
-                
-                # Обновляем прогресс
-                if progress_signal:
-                    progress_value = idx + 1
-                    progress_signal.emit(progress_value, total_files)
+                    if tournament_data_obj is None:
+                        logger.info(f"Файл {file_path} пропущен (finish_place >= 10).")
+                        results['skipped_tournaments_high_finish_place'] += 1
+                        append_summary_file_row((file_path, *file_keys[file_path], None, session_id))
+                        continue
                     
-            except Exception as e:
-                err_msg = f"Ошибка при обработке файла истории рук {file_path}: {str(e)}"
-                logger.error(err_msg, exc_info=True)
-                results['errors'].append(err_msg)
-        
-        # Обновляем статистику только если процесс не был отменен
-        if not (is_cancelled and is_cancelled()):
+                    # Проверяем finish_place перед сохранением
+                    if tournament_data_obj.finish_place > MAX_FINISH_PLACE:
+                        logger.info(f"Турнир {tournament_data_obj.tournament_id} из файла {file_path} пропущен (finish_place: {tournament_data_obj.finish_place} >= 10).")
+                        results['skipped_tournaments_high_finish_place'] += 1
+                        append_summary_file_row(
+                            (file_path, *file_keys[file_path], str(tournament_data_obj.tournament_id), session_id)
+                        )
+                        continue # Переходим к следующему файлу
+
+                    if isinstance(tournament_data_obj, TournamentSummary):
+                        append_summary_row(summary_row(tournament_data_obj, session_id))
+                    else: 
+                        data_to_save = tournament_data_obj.__dict__ if hasattr(tournament_data_obj, '__dict__') else dict(tournament_data_obj)
+                        append_summary_row(tournament_row(data_to_save, session_id))
+                    append_summary_file_row(
+                        (file_path, *file_keys[file_path], str(tournament_data_obj.tournament_id), session_id)
+                    )
+                    logger.debug(f"Успешно обработан файл сводки: {file_path}")
+                    
+                    # Обновляем прогресс
+                    progress_value = len(tournament_summary_files) + idx + 1
+                    if progress_signal and progress_value % progress_step == 0:
+                        progress_signal.emit(progress_value, total_files)
+                        
+                except Exception as e:
+                    err_msg = f"Ошибка при обработке файла сводки {file_path}: {str(e)}"
+                    logger.error(err_msg)
+                    append_error(err_msg)
+            
+            # Сохраняем информацию о турнирах
             try:
-                logger.debug(f"Обновление статистики сессии {session_id}")
-                current_stats_db.update_session_stats(session_id)
-                logger.debug(f"Обновление общей статистики")
-                current_stats_db.update_overall_statistics()
+                results['processed_tournaments'] += current_stats_db.save_tournaments_bulk(summary_rows)
+                parsed_file_rows.extend(summary_file_rows)
+                if summary_rows:
+                    current_stats_db.bump_session_stats(
+                        session_id, current_stats_db.tournament_totals(summary_rows)
+                    )
             except Exception as e:
-                err_msg = f"Ошибка при обновлении статистики после обработки файлов: {str(e)}"
+                err_msg = f"Ошибка при сохранении турниров: {str(e)}"
                 logger.error(err_msg, exc_info=True)
                 results['errors'].append(err_msg)
             
+            # Обрабатываем файлы истории рук
+            knockout_rows = []
+            initial_stack_rows = []
+            hand_history_file_rows = []
+            append_initial_stack_row = initial_stack_rows.append
+            append_hand_history_file_row = hand_history_file_rows.append
+            parsed_hand_histories = parse_map(parse_hand_history_file, hand_history_files)
+            for idx, (file_path, hand_history_data, parse_error) in enumerate(parsed_hand_histories):
+                if is_cancelled and is_cancelled():
+                    results['cancelled'] = True
+                    return results
+                    
+                try:
+                    if parse_error:
+                        raise ValueError(parse_error)
+                    
+                    # Если есть ID турнира и нокауты
+                    if hand_history_data.get('tournament_id') and hand_history_data.get('knockouts'):
+                        tournament_id = hand_history_data['tournament_id']
+                        knockout_rows.extend(
+                            knockout_row(tournament_id, ko, session_id)
+                            for ko in hand_history_data['knockouts']
+                        )
+                        
+                        # Средний начальный стек применяется к уже сохраненному турниру;
+                        # для турниров, которых еще нет в базе, обновление ни на что не влияет
+                        avg_stack = hand_history_data.get('average_initial_stack', 0)
+                        if avg_stack > 0:
+                            append_initial_stack_row((avg_stack, tournament_id, session_id))
+                    
+                    append_hand_history_file_row(
+                        (file_path, *file_keys[file_path], hand_history_data.get('tournament_id'), session_id)
+                    )
+                                
+                    logger.debug(f"Успешно обработан файл истории рук: {file_path}")
+                    
+                    # Обновляем прогресс
+                    progress_value = idx + 1
+                    if progress_signal and progress_value % progress_step == 0:
+                        progress_signal.emit(progress_value, total_files)
+                        
+                except Exception as e:
+                    err_msg = f"Ошибка при обработке файла истории рук {file_path}: {str(e)}"
+                    logger.error(err_msg)
+                    append_error(err_msg)
+        finally:
+            if parse_executor:
+                # При отмене не ждем разбора оставшихся файлов
+                parse_executor.shutdown(cancel_futures=True)
+        
+        # Сохраняем нокауты и средние стеки
+        try:
+            saved_knockouts = current_stats_db.save_knockouts_bulk(knockout_rows)
+            results['processed_knockouts'] += saved_knockouts
+            current_stats_db.update_initial_stacks_bulk(initial_stack_rows)
+            parsed_file_rows.extend(hand_history_file_rows)
+            if saved_knockouts or initial_stack_rows:
+                current_stats_db.bump_session_stats(
+                    session_id, {'knockouts': saved_knockouts, 'stacks_updated': bool(initial_stack_rows)}
+                )
+        except Exception as e:
+            err_msg = f"Ошибка при сохранении нокаутов: {str(e)}"
+            logger.error(err_msg, exc_info=True)
+            results['errors'].append(err_msg)
+        
+        try:
+            current_stats_db.save_parsed_files_bulk(parsed_file_rows)
+        except Exception as e:
+            err_msg = f"Ошибка при сохранении кэша загруженных файлов: {str(e)}"
+            logger.error(err_msg, exc_info=True)
+            results['errors'].append(err_msg)
+            
+        # Статистика сессии уже обновлена инкрементально после каждой записи,
+        # общая статистика пересчитывается в UI, когда она понадобится
         return results
 
     def on_files_processing_result(self, results: Dict):
@@ -850,7 +1180,8 @@ class MainWindow(QMainWindow):
             f"Найдено файлов истории: {results.get('hand_history_files_found', 0)}\n"
             f"Обработано турниров: {results.get('processed_tournaments',0)}\n"
             f"Пропущено турниров (место >= 10): {results.get('skipped_tournaments_high_finish_place',0)}\n"
-            f"Обработано нокаутов: {results.get('processed_knockouts',0)}"
+            f"Обработано нокаутов: {results.get('processed_knockouts',0)}\n"
+            f"Пропущено ранее загруженных файлов: {results.get('skipped_cached_files',0)}"
         )
         self.status_bar.showMessage(stats_message, 10000) 
         
@@ -860,15 +1191,11 @@ class MainWindow(QMainWindow):
         self.progress_label.setVisible(False)
         self.cancel_button.setVisible(False)
         self.load_files_button.setEnabled(True)
-        self.current_worker = None  # Сбрасываем ссылку на Worker
+        self.is_processing = False
         
+        # Статистика "Всех сессий" обновится при выборе в дереве после перезагрузки
+        self._invalidate_stats_cache()
         self.load_sessions() 
-        
-        current_item = self.sessions_tree.currentItem()
-        if current_item:
-            self.on_session_selected(current_item)
-        else: 
-            self.update_statistics()
             
         self.status_bar.showMessage("Обработка файлов завершена", 5000)
         
@@ -878,21 +1205,44 @@ class MainWindow(QMainWindow):
         self.progress_label.setVisible(False)
         self.cancel_button.setVisible(False)
         self.load_files_button.setEnabled(True)
-        self.current_worker = None  # Сбрасываем ссылку на Worker
+        self.is_processing = False
         
         QMessageBox.critical(self, "Ошибка", f"Ошибка при обработке файлов: {error_message}")
         
+        self._invalidate_stats_cache()
         self.load_sessions()
-        current_item = self.sessions_tree.currentItem()
-        if current_item:
-            self.on_session_selected(current_item)
+        
+    def _invalidate_stats_cache(self):
+        """ Помечает рассчитанную статистику устаревшей после изменения данных. """
+        self._stats_cache.clear()
+        self._last_selected_id = None
+        
+    def _show_stats(self, stats: Dict, places_distribution: np.ndarray):
+        """ Отображает статистику и распределение мест. """
+        self.stats_grid.update_stats(stats)
+        self.place_chart.update_chart(places_distribution)
+        
+    def refresh_statistics(self):
+        """ Принудительно пересчитывает статистику текущего представления. """
+        self._invalidate_stats_cache()
+        if self.current_session_id:
+            self.update_session_statistics(self.current_session_id, recompute=True)
         else:
             self.update_statistics()
-        
+            
     def update_statistics(self):
-        """ Обновляет общую статистику и графики. """
+        """
+        Обновляет общую статистику и графики.
+        
+        Агрегаты по всей базе пересчитываются только если данные изменились
+        с момента последнего расчета, иначе берутся из кэша.
+        """
         if not self.stats_db:
             return
+        cached = self._stats_cache.get(None)
+        if cached:
+            self._show_stats(*cached)
+            return
         try:
             self.stats_db.update_overall_statistics() 
             stats = self.stats_db.get_overall_statistics()
@@ -911,26 +1261,36 @@ class MainWindow(QMainWindow):
             if 'avg_initial_stack' not in stats:
                 logger.warning("В общей статистике отсутствует ключ 'avg_initial_stack'")
                 
-            self.stats_grid.update_stats(stats)
             places_distribution = self.stats_db.get_places_distribution()
-            self.place_chart.update_chart(places_distribution)
+            self._stats_cache[None] = (stats, places_distribution)
+            self._show_stats(stats, places_distribution)
             self.status_bar.showMessage("Общая статистика обновлена", 3000)
         except Exception as e:
             logger.error(f"Не удалось обновить общую статистику: {str(e)}", exc_info=True)
             QMessageBox.critical(self, "Ошибка", f"Не удалось обновить общую статистику: {str(e)}")
             
-    def update_session_statistics(self, session_id: str):
-        """ Обновляет статистику конкретной сессии. """
+    def update_session_statistics(self, session_id: str, recompute: bool = False):
+        """
+        Обновляет статистику конкретной сессии.
+        
+        Итоги сессии поддерживаются инкрементально при загрузке файлов;
+        полный пересчет по всем турнирам выполняется только при recompute=True.
+        """
         if not self.stats_db:
             return
+        cached = self._stats_cache.get(session_id)
+        if cached:
+            self._show_stats(*cached)
+            return
         try:
-            self.stats_db.update_session_stats(session_id) 
+            if recompute:
+                self.stats_db.update_session_stats(session_id)
             session_stats_from_db = self.stats_db.get_session_stats(session_id)
             
             if not session_stats_from_db:
                 logger.warning(f"Статистика для сессии {session_id} не найдена.")
                 self.stats_grid.update_stats({}) 
-                self.place_chart.update_chart({i: 0 for i in range(1, 10)}) 
+                self.place_chart.update_chart(np.zeros(9, dtype=np.int64))
                 return
                 
             stats_for_grid = {
@@ -944,49 +1304,24 @@ class MainWindow(QMainWindow):
                 'total_knockouts_x100': 0, 'total_knockouts_x1000': 0,
                 'total_knockouts_x10000': 0
             }
+            # Количество призовых мест и нокаутов по типам считаются в SQLite
+            stats_for_grid.update(self.stats_db.get_session_tournament_totals(session_id))
 
-            tournaments_in_session = self.stats_db.get_session_tournaments(session_id)
-            places_distribution_session = {i: 0 for i in range(1, 10)}
-
-            for tournament in tournaments_in_session:
-                place = tournament.get('finish_place')
-                if place == 1: stats_for_grid['first_places'] += 1
-                elif place == 2: stats_for_grid['second_places'] += 1
-                elif place == 3: stats_for_grid['third_places'] += 1
-                
-                # Для гистограммы мест сессии используем нормализованное место
-                # только если фактическое место находится в диапазоне 1-9.
-                # Турниры с местом >= 10 уже не должны попадать в БД.
-                if place and 1 <= place <= 9: 
-                    players_count_in_tournament = tournament.get('players_count', 9) or 9 
-                    
-                    # Используем исправленную формулу нормализации места
-                    if players_count_in_tournament > 1:
-                        # (place - 1) * 8 / (players_count - 1) + 1 - для линейного масштабирования диапазона [1, players_count] в [1, 9]
-                        # Если place=1, то получается 1 место (первое)
-                        # Если place=players_count, то получается 9 место (последнее)
-                        normalized_place = round((place - 1) * 8 / (players_count_in_tournament - 1) + 1)
-                        # Гарантируем, что место находится в диапазоне [1, 9]
-                        normalized_place = max(1, min(9, normalized_place))
-                    else:
-                        normalized_place = 1
-                        
-                    places_distribution_session[normalized_place] += 1
-
-                # Суммируем нокауты всех типов
-                stats_for_grid['total_knockouts_x2'] += tournament.get('knockouts_x2', 0) or 0
-                stats_for_grid['total_knockouts_x10'] += tournament.get('knockouts_x10', 0) or 0
-                stats_for_grid['total_knockouts_x100'] += tournament.get('knockouts_x100', 0) or 0
-                stats_for_grid['total_knockouts_x1000'] += tournament.get('knockouts_x1000', 0) or 0
-                stats_for_grid['total_knockouts_x10000'] += tournament.get('knockouts_x10000', 0) or 0
+            # Для гистограммы мест сессии используем нормализованное место.
+            # Турниры сгруппированы по (место, количество игроков) в SQLite,
+            # нормализация выполняется векторно по всем группам сразу.
+            # Турниры с местом >= 10 уже не должны попадать в БД.
+            places_distribution_session = _normalized_places_distribution(
+                self.stats_db.get_session_place_groups(session_id)
+            )
                 
             # Добавляем расчет ранних нокаутов для сессии
             ko_analyzer = KnockoutsAnalyzer(self.db_manager)
             early_stage_knockouts = ko_analyzer.get_early_stage_knockouts(session_id)
             stats_for_grid['early_stage_knockouts'] = early_stage_knockouts
             
-            self.stats_grid.update_stats(stats_for_grid)
-            self.place_chart.update_chart(places_distribution_session) 
+            self._stats_cache[session_id] = (stats_for_grid, places_distribution_session)
+            self._show_stats(stats_for_grid, places_distribution_session)
             
             self.status_bar.showMessage(f"Статистика сессии '{session_stats_from_db.get('session_name', session_id)}' обновлена", 3000)
         except Exception as e:
@@ -998,12 +1333,7 @@ class MainWindow(QMainWindow):
         if not self.stats_db: return
         try:
             self.db_manager.cursor.execute(
-                """
-                SELECT t.*, 
-                       (SELECT COUNT(k.id) FROM knockouts k WHERE k.tournament_id = t.tournament_id) as knockouts_count 
-                FROM tournaments t 
-                ORDER BY t.start_time DESC
-                """
+                f"{TOURNAMENT_TABLE_SELECT} ORDER BY start_time DESC"
             )
             tournaments = self.db_manager.cursor.fetchall() 
             self._update_tournaments_table(tournaments)
@@ -1016,14 +1346,8 @@ class MainWindow(QMainWindow):
         if not self.stats_db: return
         try:
             self.db_manager.cursor.execute(
-                """
-                SELECT t.*, 
-                       (SELECT COUNT(k.id) FROM knockouts k 
-                        WHERE k.tournament_id = t.tournament_id AND k.session_id = t.session_id) as knockouts_count
-                FROM tournaments t 
-                WHERE t.session_id = ? 
-                ORDER BY t.start_time DESC
-                """, (session_id,)
+                f"{TOURNAMENT_TABLE_SELECT} WHERE session_id = ? ORDER BY start_time DESC",
+                (session_id,)
             )
             tournaments = self.db_manager.cursor.fetchall()
             self._update_tournaments_table(tournaments)
@@ -1032,43 +1356,20 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить турниры сессии: {str(e)}")
             
     def _update_tournaments_table(self, tournaments: List[sqlite3.Row]):
-        """ 
-        Обновляет таблицу турниров.
         """
-        self.tournaments_table.setRowCount(0)
-        for row_idx, tournament_row in enumerate(tournaments):
-            tournament = dict(tournament_row)
-            self.tournaments_table.insertRow(row_idx)
-            
-            self.tournaments_table.setItem(row_idx, 0, QTableWidgetItem(str(tournament.get('tournament_id', 'N/A'))))
-            buy_in = tournament.get('buy_in', 0)
-            self.tournaments_table.setItem(row_idx, 1, QTableWidgetItem(f"${buy_in:.2f}" if buy_in is not None else 'N/A'))
-            self.tournaments_table.setItem(row_idx, 2, QTableWidgetItem(str(tournament.get('finish_place', 'N/A'))))
-            prize = tournament.get('prize', 0)
-            self.tournaments_table.setItem(row_idx, 3, QTableWidgetItem(f"${prize:.2f}" if prize is not None else 'N/A'))
-            self.tournaments_table.setItem(row_idx, 4, QTableWidgetItem(str(tournament.get('knockouts_count', 0)))) 
-            x10_ko = tournament.get('knockouts_x10', 0)
-            self.tournaments_table.setItem(row_idx, 5, QTableWidgetItem(str(x10_ko if x10_ko is not None else 0)))
-            start_time_str = tournament.get('start_time', 'N/A')
-            try:
-                if start_time_str and start_time_str != 'N/A':
-                    dt_obj = None
-                    for fmt in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"):
-                        try:
-                            dt_obj = datetime.strptime(start_time_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    if dt_obj:
-                         formatted_time = dt_obj.strftime('%Y-%m-%d %H:%M')
-                    else: 
-                        formatted_time = start_time_str 
-                else:
-                    formatted_time = 'N/A'
-            except Exception: 
-                formatted_time = start_time_str 
+        Обновляет таблицу турниров.
 
-            self.tournaments_table.setItem(row_idx, 6, QTableWidgetItem(formatted_time))
+        Строки передаются в модель без предварительного форматирования одним
+        сбросом; значения форматируются только для видимых ячеек.
+        """
+        # Сброс модели выполняется при отключенной перерисовке: представление
+        # перекомпонуется и перерисуется один раз, а не на каждое изменение
+        # заголовков и полос прокрутки
+        self.tournaments_table.setUpdatesEnabled(False)
+        try:
+            self.tournaments_model.set_rows(tournaments)
+        finally:
+            self.tournaments_table.setUpdatesEnabled(True)
             
     def clear_all_data(self):
         """ Очищает все данные в текущей базе. """
@@ -1086,9 +1387,12 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             try:
                 self.stats_db.clear_all_data()
+                # Статистика и таблица турниров обновляются одним проходом при выборе
+                # "Все сессии" в перезагруженном дереве (отложенный вызов из
+                # load_sessions после этого ничего не делает)
+                self._invalidate_stats_cache()
                 self.load_sessions() 
-                self.update_statistics() 
-                self.tournaments_table.setRowCount(0) 
+                self._finalize_session_tree()
                 self.status_bar.showMessage("Все данные успешно очищены")
             except Exception as e:
                 logger.error(f"Не удалось очистить данные: {str(e)}", exc_info=True)
@@ -1097,9 +1401,13 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """ Обработчик закрытия окна приложения. """
         logger.info("Закрытие приложения. Ожидание завершения потоков...")
-        self.threadpool.waitForDone(-1) 
+        self.ingest_thread.stop()
+        self.ingest_thread.wait()
         logger.info("Все потоки завершены.")
         
+        # Фигура matplotlib освобождается явно: дочерние виджеты closeEvent не получают
+        self.place_chart.release_figure()
+        
         if self.db_manager:
             logger.info("Закрытие соединения с БД.")
             self.db_manager.close()
@@ -6,10 +6,7 @@
 """
 
 import logging
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox, QGridLayout,
@@ -18,12 +15,96 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QFont, QColor, QPalette
 
+# Цвета столбцов гистограмм: 1, 2, 3 места, 4-6 места и 7-9 места
+PLACE_COLORS = (
+    '#28a745', '#17a2b8', '#6f42c1',
+    '#fd7e14', '#fd7e14', '#fd7e14',
+    '#dc3545', '#dc3545', '#dc3545'
+)
+# Цвета столбцов нокаутов x2, x10, x100, x1000, x10000
+KNOCKOUT_COLORS = ('#6610f2', '#6f42c1', '#d63384', '#dc3545', '#fd7e14')
+# Ключи количества нокаутов каждого типа: короткий и ключ из статистики
+KNOCKOUT_KEYS = (
+    ('x2', 'total_knockouts_x2'),
+    ('x10', 'total_knockouts_x10'),
+    ('x100', 'total_knockouts_x100'),
+    ('x1000', 'total_knockouts_x1000'),
+    ('x10000', 'total_knockouts_x10000')
+)
+
+# Поля графиков в долях фигуры (с запасом под подписи оси Y до 6 разрядов)
+CHART_SUBPLOT_PARAMS = dict(left=0.13, right=0.98, top=0.87, bottom=0.17)
+
+
+def _create_figure_canvas():
+    """
+    Создает фигуру matplotlib и холст Qt для нее.
+
+    matplotlib импортируется при первом вызове, то есть при первом показе
+    графика, а не при загрузке модуля: это заметно ускоряет запуск приложения.
+    """
+    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(7, 3.5), dpi=90) # Немного уменьшим размер и dpi для компактности
+    figure.patch.set_facecolor('white')
+    # Поля задаются один раз вместо tight_layout при каждом обновлении
+    figure.subplots_adjust(**CHART_SUBPLOT_PARAMS)
+    return figure, FigureCanvas(figure)
+
+
+def _release_figure_canvas(figure, canvas):
+    """
+    Освобождает фигуру и холст, созданные _create_figure_canvas.
+
+    Фигура не зарегистрирована в pyplot, поэтому plt.close не нужен:
+    достаточно очистить ее и удалить холст вместе с буфером отрисовки.
+    """
+    figure.clear()
+    canvas.setParent(None)
+    canvas.deleteLater()
+
 
 class StatsCard(QFrame):
     """
     Карточка для отображения одного статистического показателя.
     """
     
+    # Стили общие для всех карточек: строки собираются один раз, а стиль
+    # значения - один раз на каждый цвет
+    _FRAME_QSS = """
+        QFrame {
+            background-color: qlineargradient(
+                x1: 0, y1: 0, x2: 0, y2: 1,
+                stop: 0 #f8f9fa, stop: 1 #e9ecef
+            );
+            border-radius: 6px; /* Немного уменьшил радиус */
+            border: 1px solid #dee2e6;
+        }
+        QLabel {
+            background-color: transparent;
+        }
+    """
+    _TITLE_QSS = "color: #343a40; font-size: 8pt;" # Изменено на 8pt
+    _VALUE_QSS_CACHE = {}
+    
+    # Шрифты заголовка и значения общие для всех карточек. QFont можно
+    # создавать только после QApplication, поэтому они создаются при первом обращении.
+    _TITLE_FONT = None
+    _VALUE_FONT = None
+    
+    @classmethod
+    def _get_fonts(cls):
+        """Возвращает общие шрифты (заголовок, значение), создавая их при первом вызове."""
+        if cls._TITLE_FONT is None:
+            cls._TITLE_FONT = QFont()
+            cls._TITLE_FONT.setBold(True)
+            cls._VALUE_FONT = QFont()
+            # Уменьшенный размер шрифта: 18pt / 1.5 = 12pt
+            cls._VALUE_FONT.setPointSize(12)
+            cls._VALUE_FONT.setBold(True)
+        return cls._TITLE_FONT, cls._VALUE_FONT
+    
     def __init__(self, title, value, parent=None, value_color="#2c3e50"):
         super().__init__(parent)
         
@@ -35,43 +116,31 @@ class StatsCard(QFrame):
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         
         # Задаем цвет фона с градиентом
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: qlineargradient(
-                    x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #f8f9fa, stop: 1 #e9ecef
-                );
-                border-radius: 6px; /* Немного уменьшил радиус */
-                border: 1px solid #dee2e6;
-            }}
-            QLabel {{
-                background-color: transparent;
-            }}
-        """)
+        self.setStyleSheet(self._FRAME_QSS)
         
         # Создаем layout
         layout = QVBoxLayout(self)
         # Уменьшенные отступы: 10/1.5 ~ 7, 15/1.5 = 10
         layout.setContentsMargins(7, 10, 7, 10) 
         
+        title_font, value_font = self._get_fonts()
+        
         # Заголовок
         self.title_label = QLabel(title)
-        title_font = QFont()
-        title_font.setBold(True)
         # Уменьшенный размер шрифта: 11pt / 1.5 ~ 7.33pt. Используем 8pt или 7pt.
         # Попробуем 8pt. Если будет слишком крупно, можно уменьшить до 7pt.
         self.title_label.setFont(title_font) 
-        self.title_label.setStyleSheet(f"color: #343a40; font-size: 8pt;") # Изменено на 8pt
+        self.title_label.setStyleSheet(self._TITLE_QSS)
         self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        # Значение
-        self.value_label = QLabel(str(value))
-        value_font = QFont()
-        # Уменьшенный размер шрифта: 18pt / 1.5 = 12pt
-        value_font.setPointSize(12) 
-        value_font.setBold(True)
+        # Значение (текст хранится отдельно, чтобы сравнивать его без обращения к QLabel)
+        self._text = str(value)
+        self.value_label = QLabel(self._text)
         self.value_label.setFont(value_font)
-        self.value_label.setStyleSheet(f"color: {value_color}; font-size: 12pt;") # Изменено на 12pt
+        value_qss = self._VALUE_QSS_CACHE.get(value_color)
+        if value_qss is None:
+            value_qss = self._VALUE_QSS_CACHE[value_color] = f"color: {value_color}; font-size: 12pt;" # Изменено на 12pt
+        self.value_label.setStyleSheet(value_qss)
         self.value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Добавляем виджеты на layout
@@ -85,7 +154,12 @@ class StatsCard(QFrame):
         Args:
             value: Новое значение для отображения
         """
-        self.value_label.setText(str(value))
+        text = str(value)
+        # setText планирует перерисовку карточки даже для того же текста
+        if text == self._text:
+            return
+        self._text = text
+        self.value_label.setText(text)
 
 
 class PlaceDistributionChart(QWidget):
@@ -110,106 +184,158 @@ class PlaceDistributionChart(QWidget):
                 border: 1px solid #dee2e6;
             }
         """)
-        chart_layout = QVBoxLayout(chart_frame)
+        self._chart_layout = QVBoxLayout(chart_frame)
         
-        # Создаем фигуру matplotlib
-        self.figure = Figure(figsize=(7, 3.5), dpi=90) # Немного уменьшим размер и dpi для компактности
-        self.figure.patch.set_facecolor('white')
-        self.canvas = FigureCanvas(self.figure)
-        chart_layout.addWidget(self.canvas)
+        # Фигура matplotlib создается при первом показе графика (_ensure_canvas)
+        self.figure = None
+        self.canvas = None
         
         # Добавляем виджеты на layout (только фрейм с графиком, без лишнего заголовка)
         layout.addWidget(chart_frame)
         
         # Начальные данные для гистограммы
-        self.places = list(range(1, 10))
-        self.counts = [0] * 9
+        self.places = np.arange(1, 10)
+        self.counts = np.zeros(9, dtype=np.int64)
         
-        # Создаем гистограмму
-        self.update_chart({i: 0 for i in range(1, 10)})
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.canvas is None:
+            self.update_chart(self.counts)
         
-    def update_chart(self, places_distribution):
+    def release_figure(self):
         """
-        Обновляет гистограмму с новыми данными.
+        Освобождает фигуру и холст графика; при следующем показе они создаются заново.
         
-        Args:
-            places_distribution: Словарь {место: количество_турниров}
+        Дочерние виджеты не получают closeEvent, поэтому метод вызывается
+        владельцем графика (MainWindow.closeEvent).
         """
-        # Очищаем фигуру
-        self.figure.clear()
+        if self.canvas is not None:
+            _release_figure_canvas(self.figure, self.canvas)
+            self.figure = None
+            self.canvas = None
+        
+    def _ensure_canvas(self):
+        """
+        Создает фигуру, холст и оси графика, если они еще не созданы.
+        """
+        if self.canvas is not None:
+            return
+        self.figure, self.canvas = _create_figure_canvas()
+        self._chart_layout.addWidget(self.canvas)
+        # Оси, столбцы и подписи создаются один раз, при обновлении данных
+        # у них меняются только высоты и тексты
+        self._init_chart()
+        
+    def _init_chart(self):
+        """
+        Создает оси, столбцы гистограммы и подписи над ними.
+        """
+        from matplotlib.ticker import FuncFormatter
         
-        # Получаем данные
-        # Убедимся, что ключи от 1 до 9 существуют, даже если их нет в places_distribution
-        self.places = list(range(1, 10))
-        self.counts = [places_distribution.get(p, 0) for p in self.places]
-
-        # Рассчитываем проценты
-        total_tournaments = sum(self.counts)
-        percents = [count / total_tournaments * 100 if total_tournaments > 0 else 0 for count in self.counts]
-
-        # Создаем подграфик с заданным стилем
         ax = self.figure.add_subplot(111)
         ax.set_facecolor('#f8f9fa')
-        self.figure.patch.set_facecolor('white')
-        
-        colors = []
-        for place in self.places:
-            if place == 1: colors.append('#28a745') 
-            elif place == 2: colors.append('#17a2b8') 
-            elif place == 3: colors.append('#6f42c1')  
-            elif place <= 6: colors.append('#fd7e14') 
-            else: colors.append('#dc3545') 
+        self.ax = ax
         
-        bars = ax.bar(
+        self._bars = ax.bar(
             self.places, self.counts, 
-            color=colors,
+            color=PLACE_COLORS,
             edgecolor='#343a40',
             linewidth=0.5,
             alpha=0.8,
             width=0.7
         )
         
-        for i, bar in enumerate(bars):
-            height = bar.get_height()
-            if height > 0:
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2.,
-                    height + 0.05 * max(self.counts if any(self.counts) else [1]), # Динамический отступ для текста
-                    f'{int(height)}\n({percents[i]:.1f}%)',  # Добавляем проценты
-                    ha='center', va='bottom',
-                    fontweight='bold',
-                    fontsize=8 # Уменьшен шрифт подписей
-                )
+        self._texts = [
+            ax.text(
+                bar.get_x() + bar.get_width() / 2., 0, '',
+                ha='center', va='bottom',
+                fontweight='bold',
+                fontsize=8, # Уменьшен шрифт подписей
+                visible=False
+            )
+            for bar in self._bars
+        ]
         
         ax.set_xlabel('Место', fontsize=10, fontweight='bold', labelpad=8) # Уменьшены размеры
         ax.set_ylabel('Количество турниров', fontsize=10, fontweight='bold', labelpad=8) # Уменьшены размеры
         ax.set_xticks(self.places)
         ax.set_xticklabels(self.places, fontsize=9) # Уменьшены размеры
-        ax.set_yticklabels([f"{int(y)}" for y in ax.get_yticks()], fontsize=9) # Уменьшены размеры
+        ax.tick_params(axis='y', labelsize=9) # Уменьшены размеры
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"{int(y)}"))
         
         ax.grid(True, linestyle='--', alpha=0.3, axis='y')
         ax.set_xlim(0.5, len(self.places) + 0.5)
         
-        if max(self.counts) == 0:
-            ax.set_ylim(0, 5)
-        else:
-            ax.set_ylim(0, max(self.counts) * 1.25) # Немного больше места сверху
+        # Заголовок создается один раз, при обновлении меняется только текст
+        self._title = ax.set_title(
+            '',
+            fontsize=12, # Уменьшен размер
+            fontweight='bold',
+            pad=10 # Уменьшен pad
+        )
         
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
         ax.spines['left'].set_linewidth(0.5)
         ax.spines['bottom'].set_linewidth(0.5)
         
-        total_tournaments = sum(self.counts)
-        ax.set_title(
-            f'Распределение мест (всего: {total_tournaments})', 
-            fontsize=12, # Уменьшен размер
-            fontweight='bold',
-            pad=10 # Уменьшен pad
-        )
+    def update_chart(self, places_distribution):
+        """
+        Обновляет гистограмму с новыми данными.
         
-        self.figure.tight_layout(pad=2.0) # Уменьшен pad
-        self.canvas.draw()
+        Args:
+            places_distribution: Массив длины 9 (элемент place-1 — количество
+                турниров с местом place) или словарь {место: количество_турниров}
+        """
+        # Получаем данные
+        if isinstance(places_distribution, np.ndarray):
+            counts = places_distribution
+        else:
+            # Убедимся, что ключи от 1 до 9 существуют, даже если их нет в places_distribution
+            counts = np.array([places_distribution.get(p, 0) for p in self.places], dtype=np.int64)
+        
+        # Уже отрисованный график с теми же данными не перерисовывается
+        # (например, при повторном выборе сессии со статистикой из кэша)
+        if self.canvas is not None and np.array_equal(counts, self.counts):
+            return
+        self.counts = counts
+
+        # Рассчитываем проценты
+        total_tournaments = int(self.counts.sum())
+        max_count = int(self.counts.max())
+        if total_tournaments > 0:
+            percents = self.counts * (100.0 / total_tournaments)
+        else:
+            percents = np.zeros(9)
+
+        # Пока график ни разу не показывался, данные только запоминаются
+        if self.canvas is None:
+            if not self.isVisible():
+                return
+            self._ensure_canvas()
+
+        # Высоты подписей считаются одним векторным выражением
+        text_ys = self.counts + 0.05 * (max_count or 1) # Динамический отступ для текста
+        for bar, text, count, percent, y in zip(self._bars, self._texts, self.counts, percents, text_ys):
+            bar.set_height(count)
+            if count > 0:
+                text.set_y(y)
+                text.set_text(f'{int(count)}\n({percent:.1f}%)')  # Добавляем проценты
+                text.set_visible(True)
+            else:
+                text.set_visible(False)
+        
+        if max_count == 0:
+            y_max = 5
+        else:
+            y_max = max_count * 1.25 # Немного больше места сверху
+        self.ax.set_ylim(0, y_max)
+        
+        self._title.set_text(f'Распределение мест (всего: {total_tournaments})')
+        
+        # Отрисовка откладывается до цикла событий Qt: несколько обновлений
+        # подряд (смена сессии, загрузка) сливаются в одну перерисовку
+        self.canvas.draw_idle()
 
 
 class KnockoutsChart(QWidget): # Не просили изменять, но для консистентности можно тоже немного уменьшить
@@ -239,50 +365,64 @@ class KnockoutsChart(QWidget): # Не просили изменять, но дл
                 border: 1px solid #dee2e6;
             }
         """)
-        chart_layout = QVBoxLayout(chart_frame)
+        self._chart_layout = QVBoxLayout(chart_frame)
         
-        self.figure = Figure(figsize=(7, 3.5), dpi=90) # Уменьшено
-        self.figure.patch.set_facecolor('white')
-        self.canvas = FigureCanvas(self.figure)
-        chart_layout.addWidget(self.canvas)
+        # Фигура matplotlib создается при первом показе графика (_ensure_canvas)
+        self.figure = None
+        self.canvas = None
         
         layout.addWidget(title_label)
         layout.addWidget(chart_frame)
         
-        self.labels = ['x2', 'x10', 'x100', 'x1000', 'x10000']
-        self.values = [0] * 5
-        self.update_chart({'x2': 0, 'x10': 0, 'x100': 0, 'x1000': 0, 'x10000': 0})
+        self.labels = [key for key, _ in KNOCKOUT_KEYS]
+        self.values = np.zeros(len(KNOCKOUT_KEYS), dtype=np.int64)
         
-    def update_chart(self, knockouts_stats):
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.canvas is None:
+            self.update_chart(dict(zip(self.labels, self.values)))
+        
+    def release_figure(self):
         """
-        Обновляет гистограмму с новыми данными.
+        Освобождает фигуру и холст графика; при следующем показе они создаются заново.
+        
+        Дочерние виджеты не получают closeEvent, поэтому метод вызывается
+        владельцем графика (MainWindow.closeEvent).
         """
-        self.figure.clear()
-        self.values = [
-            knockouts_stats.get('x2', knockouts_stats.get('total_knockouts_x2',0)), # Поддержка обоих ключей
-            knockouts_stats.get('x10', knockouts_stats.get('total_knockouts_x10',0)),
-            knockouts_stats.get('x100', knockouts_stats.get('total_knockouts_x100',0)),
-            knockouts_stats.get('x1000', knockouts_stats.get('total_knockouts_x1000',0)),
-            knockouts_stats.get('x10000', knockouts_stats.get('total_knockouts_x10000',0))
-        ]
+        if self.canvas is not None:
+            _release_figure_canvas(self.figure, self.canvas)
+            self.figure = None
+            self.canvas = None
+        
+    def _ensure_canvas(self):
+        """
+        Создает фигуру, холст и оси графика, если они еще не созданы.
+        """
+        if self.canvas is not None:
+            return
+        self.figure, self.canvas = _create_figure_canvas()
+        self._chart_layout.addWidget(self.canvas)
+        self._init_chart()
         
+    def _init_chart(self):
+        """
+        Создает оси, столбцы гистограммы и подписи над ними.
+        """
         ax = self.figure.add_subplot(111)
         ax.set_facecolor('#f8f9fa')
-        
-        colors = ['#6610f2', '#6f42c1', '#d63384', '#dc3545', '#fd7e14']
-        
-        bars = ax.bar(self.labels, self.values, color=colors, edgecolor='#343a40', linewidth=0.5, alpha=0.8, width=0.6)
-        
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2.,
-                    height + 0.05 * max(self.values if any(self.values) else [1]), # Динамический отступ
-                    f'{int(height)}',
-                    ha='center', va='bottom',
-                    fontweight='bold', fontsize=8 # Уменьшен шрифт
-                )
+        self.ax = ax
+        
+        self._bars = ax.bar(self.labels, self.values, color=KNOCKOUT_COLORS, edgecolor='#343a40', linewidth=0.5, alpha=0.8, width=0.6)
+        
+        self._texts = [
+            ax.text(
+                bar.get_x() + bar.get_width() / 2., 0, '',
+                ha='center', va='bottom',
+                fontweight='bold', fontsize=8, # Уменьшен шрифт
+                visible=False
+            )
+            for bar in self._bars
+        ]
         
         ax.set_xlabel('Тип нокаута', fontsize=10, fontweight='bold', labelpad=8) # Уменьшено
         ax.set_ylabel('Количество', fontsize=10, fontweight='bold', labelpad=8) # Уменьшено
@@ -290,29 +430,65 @@ class KnockoutsChart(QWidget): # Не просили изменять, но дл
         ax.tick_params(axis='x', labelsize=9)
         ax.tick_params(axis='y', labelsize=9)
 
-
         ax.grid(True, linestyle='--', alpha=0.3, axis='y')
         
-        if max(self.values) == 0:
-            ax.set_ylim(0, 5)
-        else:
-            ax.set_ylim(0, max(self.values) * 1.25) # Немного больше места
+        # Заголовок создается один раз, при обновлении меняется только текст
+        self._title = ax.set_title(
+            '',
+            fontsize=12, # Уменьшено
+            fontweight='bold',
+            pad=10 # Уменьшено
+        )
             
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
         ax.spines['left'].set_linewidth(0.5)
         ax.spines['bottom'].set_linewidth(0.5)
         
-        total_knockouts = sum(self.values)
-        ax.set_title(
-            f'Нокауты по множителям (всего: {total_knockouts})', 
-            fontsize=12, # Уменьшено
-            fontweight='bold',
-            pad=10 # Уменьшено
+    def update_chart(self, knockouts_stats):
+        """
+        Обновляет гистограмму с новыми данными.
+        """
+        get = knockouts_stats.get
+        values = np.fromiter(
+            (get(key, get(stats_key, 0)) for key, stats_key in KNOCKOUT_KEYS), # Поддержка обоих ключей
+            dtype=np.int64, count=len(KNOCKOUT_KEYS)
         )
         
-        self.figure.tight_layout(pad=2.0) # Уменьшено
-        self.canvas.draw()
+        # Уже отрисованный график с теми же данными не перерисовывается
+        if self.canvas is not None and np.array_equal(values, self.values):
+            return
+        self.values = values
+        max_value = int(values.max())
+        
+        # Пока график ни разу не показывался, данные только запоминаются
+        if self.canvas is None:
+            if not self.isVisible():
+                return
+            self._ensure_canvas()
+        
+        text_ys = self.values + 0.05 * (max_value or 1) # Динамический отступ
+        for bar, text, value, y in zip(self._bars, self._texts, self.values, text_ys):
+            bar.set_height(value)
+            if value > 0:
+                text.set_y(y)
+                text.set_text(f'{int(value)}')
+                text.set_visible(True)
+            else:
+                text.set_visible(False)
+        
+        if max_value == 0:
+            y_max = 5
+        else:
+            y_max = max_value * 1.25 # Немного больше места
+        self.ax.set_ylim(0, y_max)
+        
+        total_knockouts = int(values.sum())
+        self._title.set_text(f'Нокауты по множителям (всего: {total_knockouts})')
+        
+        # Отрисовка откладывается до цикла событий Qt: несколько обновлений
+        # подряд (смена сессии, загрузка) сливаются в одну перерисовку
+        self.canvas.draw_idle()
 
 
 class StatsGrid(QWidget):
@@ -415,6 +591,14 @@ class StatsGrid(QWidget):
         main_layout.addWidget(tournaments_group)
         main_layout.addWidget(knockouts_group)
         
+        # Порядок карточек, в котором update_stats передает значения
+        self._card_order = (
+            'total_tournaments', 'avg_finish_place', 'avg_initial_stack',
+            'first_places', 'second_places', 'third_places', 'total_prize',
+            'total_knockouts', 'knockouts_x2', 'knockouts_x10', 'knockouts_x100',
+            'knockouts_x1000', 'knockouts_x10000', 'early_stage_knockouts'
+        )
+        
     def update_stats(self, stats):
         """
         Обновляет все карточки с новыми данными.
@@ -426,51 +610,54 @@ class StatsGrid(QWidget):
         logger = logging.getLogger('ROYAL_Stats.Stats')
         logger.debug(f"Обновление статистики: {stats}")
         
-        # Обновляем карточки с данными о турнирах
-        self.cards['total_tournaments'].set_value(format_number(stats.get('total_tournaments', 0)))
-        avg_finish_place = stats.get('avg_finish_place', 0.0)
+        get = stats.get
+        
+        avg_finish_place = get('avg_finish_place', 0.0)
         # Убедимся, что avg_finish_place это число перед форматированием
         try:
-            avg_finish_place_float = float(avg_finish_place)
-            self.cards['avg_finish_place'].set_value(f"{avg_finish_place_float:.2f}")
+            avg_finish_place_text = f"{float(avg_finish_place):.2f}"
         except (ValueError, TypeError):
-            self.cards['avg_finish_place'].set_value("0.00") # Значение по умолчанию, если не число
+            avg_finish_place_text = "0.00" # Значение по умолчанию, если не число
             
-        # Обновляем средний начальный стек - проверяем оба возможных ключа
-        avg_initial_stack = stats.get('avg_initial_stack', stats.get('average_initial_stack', 0.0))
+        # Средний начальный стек - проверяем оба возможных ключа
+        avg_initial_stack = get('avg_initial_stack', get('average_initial_stack', 0.0))
         try:
-            avg_initial_stack_float = float(avg_initial_stack)
             # Округляем до целого числа для более удобного отображения
-            self.cards['avg_initial_stack'].set_value(f"{int(avg_initial_stack_float)}")
+            avg_initial_stack_text = f"{int(float(avg_initial_stack))}"
         except (ValueError, TypeError):
-            self.cards['avg_initial_stack'].set_value("0") # Значение по умолчанию, если не число
-
-        self.cards['first_places'].set_value(format_number(stats.get('first_places', 0)))
-        self.cards['second_places'].set_value(format_number(stats.get('second_places', 0)))
-        self.cards['third_places'].set_value(format_number(stats.get('third_places', 0)))
+            avg_initial_stack_text = "0" # Значение по умолчанию, если не число
         
         # Расчет профита и ROI
-        total_prize = stats.get('total_prize', 0.0)
-        total_buy_in = stats.get('total_buy_in', 0.0)
+        total_prize = get('total_prize', 0.0)
+        total_buy_in = get('total_buy_in', 0.0)
         profit = total_prize - total_buy_in
         roi = 0.0
         if total_buy_in > 0:
             roi = (profit / total_buy_in) * 100
         
-        # Обновляем карточку с общим выигрышем, профитом и ROI
-        self.cards['total_prize'].set_value(f"${format_money(total_prize)} / ${format_money(profit)} / {roi:.2f}%")
-        
-        # Обновляем карточки с данными о нокаутах - проверяем наличие данных
-        total_knockouts = stats.get('total_knockouts', 0)
-        self.cards['total_knockouts'].set_value(format_number(total_knockouts))
-        self.cards['knockouts_x2'].set_value(format_number(stats.get('total_knockouts_x2', 0)))
-        self.cards['knockouts_x10'].set_value(format_number(stats.get('total_knockouts_x10', 0)))
-        self.cards['knockouts_x100'].set_value(format_number(stats.get('total_knockouts_x100', 0)))
-        self.cards['knockouts_x1000'].set_value(format_number(stats.get('total_knockouts_x1000', 0)))
-        self.cards['knockouts_x10000'].set_value(format_number(stats.get('total_knockouts_x10000', 0)))
-        # Добавляем новое поле для нокаутов на ранней стадии
-        if 'early_stage_knockouts' in self.cards:
-            self.cards['early_stage_knockouts'].set_value(format_number(stats.get('early_stage_knockouts', 0)))
+        values = (
+            format_number(get('total_tournaments', 0)),
+            avg_finish_place_text,
+            avg_initial_stack_text,
+            format_number(get('first_places', 0)),
+            format_number(get('second_places', 0)),
+            format_number(get('third_places', 0)),
+            # Общий выигрыш, профит и ROI
+            f"${format_money(total_prize)} / ${format_money(profit)} / {roi:.2f}%",
+            format_number(get('total_knockouts', 0)),
+            format_number(get('total_knockouts_x2', 0)),
+            format_number(get('total_knockouts_x10', 0)),
+            format_number(get('total_knockouts_x100', 0)),
+            format_number(get('total_knockouts_x1000', 0)),
+            format_number(get('total_knockouts_x10000', 0)),
+            format_number(get('early_stage_knockouts', 0)),
+        )
+        
+        # QLabel.setText сам объединяет перерисовку измененных меток в один проход,
+        # а неизмененные карточки не перерисовываются (см. StatsCard.set_value)
+        cards = self.cards
+        for key, value in zip(self._card_order, values):
+            cards[key].set_value(value)
 
 
 # Вспомогательные функции для форматирования чисел
@@ -479,8 +666,8 @@ def format_number(number):
     Форматирует число с разделителями тысяч.
     """
     try:
-        num = int(number)
-        return f"{num:,}".replace(',', ' ')
+        # Группировка подчеркиванием не зависит от локали
+        return f"{int(number):_}".replace('_', ' ')
     except (ValueError, TypeError):
         return str(number) # Возвращаем как есть, если не число
 
@@ -488,12 +675,10 @@ def format_money(amount):
     """
     Форматирует денежную сумму с разделителями тысяч и двумя знаками после запятой.
     """
+    # Числа форматируются сразу, без пробного преобразования
+    if isinstance(amount, (int, float)):
+        return f"{amount:_.2f}".replace('_', ' ')
     try:
-        num = float(amount)
-        return f"{num:,.2f}".replace(',', ' ')
+        return f"{float(amount):_.2f}".replace('_', ' ')
     except (ValueError, TypeError):
-        try: # Попытка отформатировать как целое, если float не удался
-            num_int = int(amount)
-            return f"{num_int:,.2f}".replace(',', ' ')
-        except (ValueError, TypeError):
-            return str(amount) # Возвращаем как есть, если не число
\ No newline at end of file
+        return str(amount) # Возвращаем как есть, если не число